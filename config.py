@@ -53,3 +53,23 @@ LINKEDIN_F_WT = "3,2,1"  # 3=Hybrid, 2=Remote, 1=Onsite
 CAREERS_FUTURE_SEARCH_QUERIES = ["junior machine learning engineer", "machine learning engineer", "ML engineer"]
 CAREERS_FUTURE_SEARCH_CATEGORIES = ["Information Technology"]
 CAREERS_FUTURE_SEARCH_EMPLOYMENT_TYPES = ["Full Time"]
+
+# --- Detail Fetching Configuration ---
+DETAIL_FETCH_CONCURRENCY = 6  # Job detail requests in flight at once
+DETAIL_FETCH_MAX_CONNECTIONS = 8  # Connection pool size for detail fetching
+PARSE_MAX_WORKERS = 2  # Worker processes parsing LinkedIn job pages
+SAVE_BATCH_SIZE = 100  # New jobs fetched and saved to Supabase per batch
+SAVE_QUEUE_MAX_BATCHES = 4  # Batches waiting for the save thread before scraping pauses
+LINKEDIN_DETAIL_MAX_RATE = 4  # LinkedIn job detail requests allowed per LINKEDIN_DETAIL_RATE_PERIOD
+LINKEDIN_DETAIL_RATE_PERIOD = 1.0  # Seconds
+LINKEDIN_SEARCH_MAX_RATE = 1  # LinkedIn search page requests allowed per LINKEDIN_SEARCH_RATE_PERIOD
+LINKEDIN_SEARCH_RATE_PERIOD = 3.0  # Seconds
+CAREERS_FUTURE_MAX_RATE = 5  # CareersFuture API requests allowed per CAREERS_FUTURE_RATE_PERIOD
+CAREERS_FUTURE_RATE_PERIOD = 1.0  # Seconds
+
+# --- Seen Jobs Cache ---
+SEEN_JOBS_DB_PATH = os.path.expanduser("~/.cache/listing/seen.db")  # SQLite record of job IDs saved by earlier runs
+
+# --- Markdown Conversion Configuration ---
+MARKDOWN_BATCH_SIZE = 10  # Job descriptions converted per Gemini request
+MARKDOWN_CACHE_DIR = os.path.expanduser("~/.cache/listing/markdown")  # Converted descriptions, reused across runs
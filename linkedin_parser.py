@@ -0,0 +1,144 @@
+"""
+LinkedIn page parsing.
+Runs in the scraper's parse worker processes, which import this module on start-up,
+so it must stay free of import-time side effects: no clients, sessions, caches or config reads.
+"""
+import logging
+import re
+
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    """XPath step for tag elements whose class list contains class_name (same as a CSS .class selector)."""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+# Compiled once; each returns a list, of which the parser uses the first match
+XPATH_JOB_URN = etree.XPath(f"//li//{_class_xpath('div', 'base-card')}[contains(@data-entity-urn, 'jobPosting:')]/@data-entity-urn")
+JOB_URN_RE = re.compile(r"jobPosting:(\d+)")
+XPATH_COMPANY_IMG_ALT = etree.XPath(f"((//{_class_xpath('div', 'top-card-layout__card')})[1]//a)[1]//img[1]/@alt")
+XPATH_COMPANY_LINK = etree.XPath(f"//{_class_xpath('a', 'topcard__org-name-link')}")
+XPATH_COMPANY_FLAVOR = etree.XPath(f"//{_class_xpath('span', 'topcard__flavor')}")
+XPATH_TITLE_LINK = etree.XPath(f"(//{_class_xpath('div', 'top-card-layout__entity-info')})[1]//a")
+XPATH_TITLE_H1 = etree.XPath(f"//{_class_xpath('h1', 'top-card-layout__title')}")
+XPATH_CRITERIA_LI = etree.XPath(f"(//{_class_xpath('ul', 'description__job-criteria-list')})[1]//li")
+XPATH_CRITERIA_SUBHEADER = etree.XPath(f".//{_class_xpath('h3', 'description__job-criteria-subheader')}")
+XPATH_CRITERIA_TEXT = etree.XPath(f".//{_class_xpath('span', 'description__job-criteria-text')}")
+XPATH_LOCATION = etree.XPath("//span[@class='topcard__flavor topcard__flavor--bullet']")
+XPATH_LOCATION_FALLBACK = etree.XPath(f"(//{_class_xpath('div', 'topcard__flavor-row')})[1]//{_class_xpath('span', 'topcard__flavor')}")
+XPATH_DESC = etree.XPath(f"//{_class_xpath('div', 'show-more-less-html__markup')}")
+
+# LinkedIn serves UTF-8; decoding the raw bytes in libxml2 skips building a Python str first
+LINKEDIN_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+def _first(xpath: etree.XPath, node):
+    """First result of a compiled XPath on node, or None."""
+    matches = xpath(node)
+    return matches[0] if matches else None
+
+def parse_job_details(job_id: str, html: bytes) -> dict | None:
+    """Extracts job fields from a LinkedIn job posting page. The description is left as plain text."""
+
+    try:
+        tree = lxml_html.fromstring(html, parser=LINKEDIN_HTML_PARSER)
+        job_details = {"job_id": job_id}
+
+        # --- Extract Company ---
+        try:
+            company_img_alt = _first(XPATH_COMPANY_IMG_ALT, tree)
+            if company_img_alt:
+                job_details["company"] = company_img_alt.strip()
+            if not job_details.get("company"):
+                 company_link = _first(XPATH_COMPANY_LINK, tree)
+                 if company_link is not None:
+                      job_details["company"] = company_link.text_content().strip()
+                 else:
+                      sub_title_span = _first(XPATH_COMPANY_FLAVOR, tree)
+                      if sub_title_span is not None:
+                           job_details["company"] = sub_title_span.text_content().strip()
+
+            if not job_details.get("company"):
+                 job_details["company"] = None
+                 logger.warning("Could not extract company for job ID %s", job_id)
+        except Exception as e:
+            logger.error("Error extracting company for job ID %s: %s", job_id, e)
+            job_details["company"] = None
+
+        # --- Extract Job Title ---
+        try:
+            title_link = _first(XPATH_TITLE_LINK, tree)
+            job_details["job_title"] = title_link.text_content().strip() if title_link is not None else None
+            if not job_details["job_title"]:
+                 title_h1 = _first(XPATH_TITLE_H1, tree)
+                 if title_h1 is not None:
+                      job_details["job_title"] = title_h1.text_content().strip()
+        except Exception as e: 
+            logger.error("Error extracting job title for job ID %s: %s", job_id, e)
+            job_details["job_title"] = None
+
+        # --- Extract Seniority Level ---
+        try:
+            # Find all criteria items
+            criteria_items = XPATH_CRITERIA_LI(tree)
+            job_details["level"] = None 
+            for item in criteria_items:
+                header = _first(XPATH_CRITERIA_SUBHEADER, item)
+                if header is not None and "Seniority level" in header.text_content():
+                    level_text = _first(XPATH_CRITERIA_TEXT, item)
+                    if level_text is not None:
+                        job_details["level"] = level_text.text_content().strip()
+                        break 
+        except Exception as e: 
+            logger.error("Error extracting seniority level for job ID %s: %s", job_id, e)
+            job_details["level"] = None
+
+        # --- Extract Location ---
+        try:
+           
+            location_span = _first(XPATH_LOCATION, tree)
+            if location_span is None:
+                location_span = _first(XPATH_LOCATION_FALLBACK, tree)
+            if location_span is not None:
+                job_details["location"] = location_span.text_content().strip()
+
+            if not job_details.get("location"): 
+                 job_details["location"] = None
+                 logger.warning("Could not extract location for job ID %s", job_id)
+        except Exception as e:
+            logger.error("Error extracting location for job ID %s: %s", job_id, e)
+            job_details["location"] = None
+
+        # --- Extract Description ---
+        raw_description_text = "" 
+        try:
+            description_div = _first(XPATH_DESC, tree)
+            if description_div is not None:
+                # One stripped line per text node, dropping blanks
+                lines = [text.strip() for text in description_div.itertext() if text.strip()]
+                raw_description_text = "\n".join(lines)
+            else:
+                
+                logger.warning("Could not find description div for job ID %s", job_id)
+                
+        except Exception as e:
+                
+                logger.error("Error extracting raw description for job ID %s: %s", job_id, e)
+                raw_description_text = "" 
+
+        
+        if raw_description_text.strip():
+            job_details["description"] = raw_description_text
+        else:
+            job_details["description"] = None 
+            logger.warning("Raw description was empty for job ID %s. Skipping AI conversion.", job_id) 
+
+        # --- Set Provider ---
+        job_details["provider"] = "linkedin"
+        
+        return job_details
+
+    except Exception as e:
+         
+         logger.error("General Error processing details for job ID %s after successful fetch: %s", job_id, e)
+         return None
@@ -0,0 +1,347 @@
+"""
+Shared Gemini quota tracking.
+Both the scraper and the resume parser draw from the same Gemini API key, so they
+share one RateLimiter implementation and one state file on disk.
+"""
+import atexit
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; fall back to the atomic replace alone
+    fcntl = None
+
+QUOTA_STATE_FILE = "quota_state.json"  # File to persist quota across runs
+QUOTA_FLUSH_INTERVAL = 5.0  # Minimum seconds between quota state writes
+RATE_WINDOW_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    In-memory token bucket used to pace requests.
+    Tokens refill continuously at refill_rate per second up to capacity,
+    so checking the rate limit is plain arithmetic instead of a file round-trip.
+    """
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def try_acquire(self):
+        """
+        Take one token if available.
+        Returns (True, 0.0) on success, otherwise (False, seconds until a token is available).
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.refill_rate
+
+
+class _StateFileLock:
+    """Exclusive advisory lock on a sidecar file so only one process touches the state at a time."""
+
+    def __init__(self, state_file):
+        self.lock_file = state_file + ".lock"
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = open(self.lock_file, 'w')
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._fd.close()
+            self._fd = None
+
+
+class RateLimiter:
+    """
+    Enforces the Gemini per-minute and per-day request limits.
+    State lives in memory and is flushed to state_file at most every
+    QUOTA_FLUSH_INTERVAL seconds and on interpreter exit.
+
+    Args:
+        max_requests_per_minute (int): Requests allowed in any sliding minute.
+        max_requests_per_day (int): Requests allowed per calendar day.
+        logger (logging.Logger | None): Where to report quota status; print() is used when None.
+        state_file (str): Path of the JSON file shared between processes.
+    """
+
+    def __init__(self, max_requests_per_minute, max_requests_per_day, logger=None, state_file=QUOTA_STATE_FILE):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_requests_per_day = max_requests_per_day
+        self.logger = logger
+        self.state_file = state_file
+
+        self.bucket = TokenBucket(capacity=max_requests_per_minute, refill_rate=max_requests_per_minute / 60.0)
+        self.daily_request_count = 0
+        self.daily_reset_date = None
+        # Sliding window counter: request counts for the current and previous minute-long
+        # windows; window_start is on the time.monotonic() clock
+        self.window_start = time.monotonic()
+        self.curr_window_count = 0
+        self.prev_window_count = 0
+
+        self._dirty = False
+        self._pending_requests = 0  # Requests (net of rollbacks) made since the state file was last written
+        self._last_flush = 0.0
+        self._state_mtime = None  # mtime of the state file as of our last read or write
+        self._lock = threading.Lock()  # Serializes acquire()/rollback() across threads
+        self._quota_exhausted_until = None  # Unix time of the next midnight once today's quota is used up
+
+        self.load_state(restore_bucket=True)
+        atexit.register(self.save_state, force=True)
+
+    def _info(self, message):
+        if self.logger:
+            self.logger.info(message)
+        else:
+            print(message)
+
+    def _warning(self, message):
+        if self.logger:
+            self.logger.warning(message)
+        else:
+            print(message)
+
+    def _state_file_mtime(self):
+        try:
+            return os.stat(self.state_file).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self):
+        """
+        Reload the state file only if another process has written it since our last read or write.
+        Steady-state cost is a single stat() call. Unflushed local requests are re-applied on top of it.
+        """
+        if self._state_file_mtime() != self._state_mtime:
+            self.load_state()
+
+    def _read_state(self):
+        """Parsed state file, or None if it is missing or unreadable. Caller holds the file lock."""
+        try:
+            with open(self.state_file, 'rb') as f:
+                state = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError as e:
+            self._warning(f"⚠️  Ignoring unreadable quota state: {e}")
+            return None
+        self._state_mtime = self._state_file_mtime()
+        return state
+
+    def _merge_state(self, state, restore_bucket=False):
+        """
+        Adopt the persisted counters, then re-apply this process's requests that are not in the file yet.
+        Caller holds the file lock.
+        """
+        local_date = self.daily_reset_date
+        self.daily_request_count = state.get("daily_request_count", 0)
+        reset_date = state.get("daily_reset_date")
+        self.daily_reset_date = datetime.fromisoformat(reset_date).date() if reset_date else None
+        # Persisted timestamps are Unix seconds; convert them onto this process's monotonic clock
+        window_start = state.get("window_start")
+        if window_start:
+            self.window_start = window_start + time.monotonic() - time.time()
+            self.curr_window_count = state.get("curr_window_count", 0)
+            self.prev_window_count = state.get("prev_window_count", 0)
+
+        if local_date is not None and (self.daily_reset_date is None or local_date > self.daily_reset_date):
+            # The file still holds an earlier day; this process has already moved on to a new one
+            self.daily_reset_date = local_date
+            self.daily_request_count = 0
+            self.curr_window_count = 0
+            self.prev_window_count = 0
+
+        if self._pending_requests:
+            self._roll_window(time.monotonic())
+            self.daily_request_count = max(0, self.daily_request_count + self._pending_requests)
+            self.curr_window_count = max(0, self.curr_window_count + self._pending_requests)
+
+        # Assume the bucket was drained at the last persisted refill so a
+        # fresh process cannot burst past the previous run's pace.
+        last_refill = state.get("last_refill")
+        if restore_bucket and last_refill:
+            elapsed = time.time() - last_refill
+            self.bucket.tokens = min(self.bucket.capacity, max(0.0, elapsed) * self.bucket.refill_rate)
+
+    def load_state(self, restore_bucket=False):
+        """
+        Load persisted daily usage from the state file.
+        The in-memory token bucket is only seeded when restore_bucket is set (at start-up);
+        later reloads share the window and daily counters but keep this process's own tokens.
+        """
+        if not os.path.exists(self.state_file):
+            return
+
+        try:
+            with _StateFileLock(self.state_file):
+                state = self._read_state()
+                if state is not None:
+                    self._merge_state(state, restore_bucket)
+        except Exception as e:
+            self._warning(f"⚠️  Error loading quota state: {e}. Starting fresh.")
+
+    def save_state(self, force=False):
+        """
+        Save daily usage and last refill time to the state file.
+        Writes are debounced: skipped unless state changed and QUOTA_FLUSH_INTERVAL
+        seconds have passed since the last flush, or force is set (atexit).
+        The file is re-read under the lock and this process's unflushed requests are added
+        to it, so processes sharing the file never overwrite each other's counts.
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_flush < QUOTA_FLUSH_INTERVAL:
+            return
+
+        # Write to a temp file and swap it in so a kill mid-write can't corrupt state
+        tmp_file = self.state_file + ".tmp"
+        try:
+            with _StateFileLock(self.state_file):
+                state = self._read_state()
+                if state is not None:
+                    self._merge_state(state)
+                self._pending_requests = 0
+
+                # Timestamps are stored as Unix seconds; orjson writes the reset date as an ISO string
+                offset = time.time() - time.monotonic()
+                state = {
+                    "daily_request_count": self.daily_request_count,
+                    "daily_reset_date": self.daily_reset_date,
+                    "last_refill": self.bucket.last_refill + offset,
+                    "window_start": self.window_start + offset,
+                    "curr_window_count": self.curr_window_count,
+                    "prev_window_count": self.prev_window_count
+                }
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(state))
+                os.replace(tmp_file, self.state_file)
+                self._state_mtime = self._state_file_mtime()
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            self._warning(f"⚠️  Error saving quota state: {e}")
+
+    def _roll_window(self, now):
+        """Advance window_start in whole windows, carrying the count into prev_window_count"""
+        windows_passed = int((now - self.window_start) // RATE_WINDOW_SECONDS)
+        if windows_passed <= 0:
+            return
+        self.prev_window_count = self.curr_window_count if windows_passed == 1 else 0
+        self.curr_window_count = 0
+        self.window_start += windows_passed * RATE_WINDOW_SECONDS
+
+    def _estimated_rate(self, now):
+        """Requests in the sliding minute ending now, weighting the previous window by its overlap"""
+        self._roll_window(now)
+        overlap = 1.0 - (now - self.window_start) / RATE_WINDOW_SECONDS
+        return self.prev_window_count * overlap + self.curr_window_count
+
+    def _window_wait(self, now):
+        """Seconds until the estimated rate drops below max_requests_per_minute (0.0 if it already has)"""
+        rate = self._estimated_rate(now)
+        if rate < self.max_requests_per_minute:
+            return 0.0
+        remaining = self.max_requests_per_minute - self.curr_window_count
+        if remaining <= 0 or not self.prev_window_count:
+            # Only the next window roll can free capacity
+            return self.window_start + RATE_WINDOW_SECONDS - now
+        # Solve prev * (1 - elapsed / window) + curr < max for elapsed
+        free_at = self.window_start + RATE_WINDOW_SECONDS * (1.0 - remaining / self.prev_window_count)
+        return max(0.0, free_at - now)
+
+    def acquire(self):
+        """
+        Check quota limits and enforce rate limiting, blocking until a request may be sent.
+        Thread-safe: concurrent callers are served one at a time.
+        Returns True if request can proceed, False if the daily quota is exceeded.
+        """
+        if self._quota_exhausted_until and time.time() < self._quota_exhausted_until:
+            return False
+        with self._lock:
+            return self._acquire()
+
+    def _acquire(self):
+        current_time = datetime.now()
+        self.refresh()
+
+        # Reset daily counter if it's a new day
+        if self.daily_reset_date is None or current_time.date() > self.daily_reset_date:
+            self.daily_request_count = 0
+            self.daily_reset_date = current_time.date()
+            self.curr_window_count = 0  # Clear old window counts on new day
+            self.prev_window_count = 0
+            self._pending_requests = 0  # Requests from the previous day no longer count
+            self._info(f"📅 Daily quota reset for {self.daily_reset_date}")
+            self._dirty = True
+            self.save_state(force=True)
+
+        # Check daily limit
+        if self.daily_request_count >= self.max_requests_per_day:
+            self._warning(f"❌ Daily quota exceeded: {self.daily_request_count}/{self.max_requests_per_day} requests used today")
+            self._warning(f"⏳ Quota resets at midnight. Current time: {current_time.strftime('%H:%M:%S')}")
+            # Later calls today fail on an in-memory check without touching the state file
+            next_midnight = datetime.combine(current_time.date() + timedelta(days=1), datetime.min.time())
+            self._quota_exhausted_until = next_midnight.timestamp()
+            return False
+
+        # Check RPM limit over the sliding minute. The monotonic clock is used for all
+        # wait arithmetic so NTP adjustments or DST changes cannot skew it.
+        wait_time = self._window_wait(time.monotonic())
+        if wait_time > 0:
+            self._info(f"⏸️  RPM limit reached (~{self._estimated_rate(time.monotonic()):.1f}/{self.max_requests_per_minute})")
+            self._info(f"⏳ Waiting {wait_time:.1f} seconds before next request...")
+            while wait_time > 0:
+                time.sleep(wait_time)
+                wait_time = self._window_wait(time.monotonic())
+
+        # Pace requests with the token bucket
+        acquired, wait_time = self.bucket.try_acquire()
+        while not acquired:
+            self._info(f"⏳ Rate limiting: waiting {wait_time:.1f} seconds...")
+            time.sleep(wait_time)
+            acquired, wait_time = self.bucket.try_acquire()
+
+        # Record this request
+        self._roll_window(time.monotonic())
+        self.curr_window_count += 1
+        self.daily_request_count += 1
+        self._pending_requests += 1
+        self._dirty = True
+        self.save_state()
+
+        self._info(f"📊 Quota status: {self.daily_request_count}/{self.max_requests_per_day} daily requests | "
+                   f"~{self._estimated_rate(time.monotonic()):.1f}/{self.max_requests_per_minute} requests in last minute")
+
+        return True
+
+    def rollback(self):
+        """
+        Undo the bookkeeping of the last acquire() after the request itself failed.
+        Only in-memory state changes; the next debounced flush or interpreter exit persists it.
+        """
+        with self._lock:
+            self.daily_request_count = max(0, self.daily_request_count - 1)
+            self.curr_window_count = max(0, self.curr_window_count - 1)
+            self._pending_requests -= 1
+            self._dirty = True
+            self._quota_exhausted_until = None
@@ -1,9 +1,9 @@
 import pdfplumber
+import pypdfium2 as pdfium
 from google import genai
 import config
 from parse_resume_with_ai import parse_resume_with_ai
-import json
-from supabase_utils import save_resume_to_supabase 
+from supabase_utils import queue_resume_for_supabase
 import time
 
 client = genai.Client(api_key=config.GEMINI_FIRST_API_KEY)
@@ -17,11 +17,21 @@ def extract_text_from_pdf(pdf_path):
         str: The extracted text content from the PDF.
     """
     print(f"Extracting text from: {pdf_path}")
-    text = ""
+    # PDFium is a native library and far faster than pdfminer for plain text
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        text = "\n".join(pdf[i].get_textpage().get_text_range() for i in range(len(pdf)))
+    finally:
+        pdf.close()
+    # PDFium separates lines with \r\n
+    text = text.replace("\r\n", "\n")
+    if text.strip():
+        return text
+
+    print("PDFium returned no text, retrying with pdfplumber")
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
+        # extract_text() returns None for blank pages
+        return "\n".join(page.extract_text() or "" for page in pdf.pages)
 
 def main(pdf_file_path):
     """
@@ -34,21 +44,14 @@ def main(pdf_file_path):
         return
     
     # 2. Parse resume text with AI
-    parsed_resume_details_str = parse_resume_with_ai(client, resume_text)
-    if not parsed_resume_details_str:
+    parsed_resume = parse_resume_with_ai(client, resume_text)
+    if not parsed_resume:
         print("Failed to parse resume. Exiting.")
         return
     
-    try:
-        # Convert the JSON string response to a dictionary
-        resume_data_dict = json.loads(parsed_resume_details_str)
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON response from AI: {e}")
-        print(f"Raw response: {parsed_resume_details_str}")
-        return
-    
-    # 3. Save parsed data to Supabase
-    save_resume_to_supabase(resume_data_dict) # Call the save function
+    # 3. Queue parsed data for Supabase; the background writer is flushed at exit
+    resume_data_dict = parsed_resume.model_dump(mode="json")
+    queue_resume_for_supabase(resume_data_dict)
     
     print("\nResume processing finished.")
     # Optionally print the data that was sent to Supabase
@@ -1,20 +1,90 @@
+import argparse
+import asyncio
+import atexit
+import functools
+import hashlib
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import re
+import queue
+import threading
+import weakref
+from collections.abc import Iterator
 import time 
 import random 
 import logging
 import config
 import user_agents
 import supabase_utils
-import html2text
+import linkedin_parser
+from seen_jobs import SeenJobsStore
+import diskcache
 from google import genai
 from google.genai import types
 import json
+import orjson
 import os
+from quota import RateLimiter, TokenBucket
+from aiolimiter import AsyncLimiter
+
+try:
+    import uvloop
+except ImportError:  # Optional (no Windows wheels); the stock asyncio loop is used without it
+    uvloop = None
 
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# --- Shared HTTP Sessions ---
+# Reusing a session keeps connections alive across requests instead of paying a
+# TCP + TLS handshake per page. Each site gets its own session so its pool stays warm.
+# Retries, including 429s, are handled by urllib3 on the session's adapter.
+RETRY_STATUS_FORCELIST = [429, 500, 502, 503, 504]
+
+def _make_session(retry: Retry) -> requests.Session:
+    """Create a pooled session whose adapters retry according to retry."""
+    new_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    new_session.mount("https://", adapter)
+    new_session.mount("http://", adapter)
+    return new_session
+
+class _LinkedInRetry(Retry):
+    """
+    Retry that waits RETRY_DELAY_SECONDS plus up to 5 seconds of jitter before every retry.
+    urllib3's exponential backoff resends the first retry immediately, which LinkedIn answers with another 429.
+    A Retry-After header on the response still takes precedence.
+    """
+
+    def get_backoff_time(self) -> float:
+        wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5)
+        logger.warning("Retrying LinkedIn request (attempt %d/%d) after %.2f seconds...",
+                       len(self.history), config.MAX_RETRIES, wait_time)
+        return wait_time
+
+linkedin_session = _make_session(_LinkedInRetry(
+    total=config.MAX_RETRIES,
+    status_forcelist=RETRY_STATUS_FORCELIST,
+    allowed_methods=["GET", "POST"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+))
+careers_future_session = _make_session(Retry(
+    total=config.MAX_RETRIES,
+    backoff_factor=1,
+    status_forcelist=RETRY_STATUS_FORCELIST,
+    allowed_methods=["GET", "POST"],  # The CareersFuture search POSTs are read-only
+    respect_retry_after_header=True,
+    raise_on_status=False,
+))
 
 # --- Initialize Gemini Client ---
 client = genai.Client(api_key=config.GEMINI_FIRST_API_KEY)
@@ -24,191 +94,136 @@ client = genai.Client(api_key=config.GEMINI_FIRST_API_KEY)
 # =====================================================================
 MAX_REQUESTS_PER_MINUTE = 4
 MAX_REQUESTS_PER_DAY = 20
-SECONDS_BETWEEN_REQUESTS = 60 / MAX_REQUESTS_PER_MINUTE  # 15 seconds
-QUOTA_STATE_FILE = "quota_state.json"
-
-
-def load_quota_state():
-    """Load quota state from file"""
-    if not os.path.exists(QUOTA_STATE_FILE):
-        return {
-            "daily_request_count": 0,
-            "daily_reset_date": None,
-            "request_timestamps": []
-        }
-    
-    try:
-        with open(QUOTA_STATE_FILE, 'r') as f:
-            state = json.load(f)
-            # Convert timestamp strings back to datetime objects
-            state["request_timestamps"] = [
-                datetime.fromisoformat(ts) for ts in state.get("request_timestamps", [])
-            ]
-            return state
-    except Exception as e:
-        logging.warning(f"Error loading quota state: {e}. Starting fresh.")
-        return {
-            "daily_request_count": 0,
-            "daily_reset_date": None,
-            "request_timestamps": []
-        }
-
 
-def save_quota_state(daily_count, reset_date, timestamps):
-    """Save quota state to file"""
-    state = {
-        "daily_request_count": daily_count,
-        "daily_reset_date": reset_date.isoformat() if reset_date else None,
-        "request_timestamps": [ts.isoformat() for ts in timestamps]
-    }
-    
-    try:
-        with open(QUOTA_STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
-    except Exception as e:
-        logging.warning(f"Error saving quota state: {e}")
-
-
-def check_and_enforce_quota():
-    """
-    Check quota limits and enforce rate limiting.
-    Returns True if request can proceed, False if quota exceeded.
-    """
-    # Load state from file
-    state = load_quota_state()
-    daily_request_count = state["daily_request_count"]
-    daily_reset_date = state["daily_reset_date"]
-    request_timestamps = state["request_timestamps"]
-    
-    # Parse reset date if it exists
-    if daily_reset_date:
-        daily_reset_date = datetime.fromisoformat(daily_reset_date).date()
-    
-    current_time = datetime.now()
-    
-    # Reset daily counter if it's a new day
-    if daily_reset_date is None or current_time.date() > daily_reset_date:
-        daily_request_count = 0
-        daily_reset_date = current_time.date()
-        request_timestamps = []
-        logging.info(f"📅 Daily quota reset for {daily_reset_date}")
-    
-    # Check daily limit
-    if daily_request_count >= MAX_REQUESTS_PER_DAY:
-        logging.warning(f"❌ Daily quota exceeded: {daily_request_count}/{MAX_REQUESTS_PER_DAY} requests used today")
-        logging.warning(f"⏳ Quota resets at midnight. Current time: {current_time.strftime('%H:%M:%S')}")
-        return False
-    
-    # Remove timestamps older than 1 minute
-    one_minute_ago = current_time - timedelta(minutes=1)
-    request_timestamps = [ts for ts in request_timestamps if ts > one_minute_ago]
-    
-    # Check RPM limit
-    if len(request_timestamps) >= MAX_REQUESTS_PER_MINUTE:
-        oldest_request = min(request_timestamps)
-        wait_time = 60 - (current_time - oldest_request).total_seconds()
-        if wait_time > 0:
-            logging.info(f"⏸️  RPM limit reached ({len(request_timestamps)}/{MAX_REQUESTS_PER_MINUTE})")
-            logging.info(f"⏳ Waiting {wait_time:.1f} seconds before next request...")
-            time.sleep(wait_time + 1)
-            current_time = datetime.now()
-    
-    # Enforce minimum time between requests (15 seconds for 4 RPM)
-    if request_timestamps:
-        last_request = max(request_timestamps)
-        elapsed = (current_time - last_request).total_seconds()
-        if elapsed < SECONDS_BETWEEN_REQUESTS:
-            wait_time = SECONDS_BETWEEN_REQUESTS - elapsed
-            logging.info(f"⏳ Rate limiting: waiting {wait_time:.1f} seconds...")
-            time.sleep(wait_time)
-            current_time = datetime.now()
-    
-    # Record this request
-    request_timestamps.append(current_time)
-    daily_request_count += 1
-    
-    logging.info(f"📊 Quota status: {daily_request_count}/{MAX_REQUESTS_PER_DAY} daily requests | "
-          f"{len(request_timestamps)}/{MAX_REQUESTS_PER_MINUTE} requests in last minute")
-    
-    # Save updated state to file
-    save_quota_state(daily_request_count, daily_reset_date, request_timestamps)
-    
-    return True
+gemini_quota = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_REQUESTS_PER_DAY, logger=logger)
 
 # =====================================================================
 # END OF QUOTA TRACKING
 # =====================================================================
 
-# Convert description to Markdown
-def convert_plain_text_to_markdown_with_ai(text: str) -> str | None:
-    """
-    Convert plain text to Markdown using Gemini Flash Lite model.
-    """
-    if not text:
-        logging.info("Received empty text for Markdown conversion, returning empty string.")
-        return "" 
+# --- Markdown Cache ---
+# Reposted jobs often carry the same description; converted Markdown is kept on disk
+# across runs, with an in-memory LRU in front of it.
+markdown_disk_cache = diskcache.Cache(config.MARKDOWN_CACHE_DIR)
 
-    logging.info("Converting description text to Markdown using Gemini Lite...")
+def _markdown_cache_key(text: str) -> str:
+    """Hash of the text with whitespace normalized, so reflowed copies share an entry."""
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
 
-    # ✅ CHECK QUOTA BEFORE MAKING REQUEST
-    if not check_and_enforce_quota():
-        logging.warning("⚠️ Gemini quota exceeded. Returning plain text instead of Markdown.")
-        return text  # Return original text when quota is exceeded
+@functools.lru_cache(maxsize=2048)
+def _cached_markdown(cache_key: str) -> str:
+    """Markdown previously stored for cache_key. Raises KeyError on a miss, which lru_cache does not memoize."""
+    markdown_content = markdown_disk_cache.get(cache_key)
+    if markdown_content is None:
+        raise KeyError(cache_key)
+    return markdown_content
 
-    system_prompt = f"""
-    You are a Markdown formatter.
-    Your task is to convert plain text into well-structured Markdown.
-    You must not alter, paraphrase, or omit any part of the input text.
-    Only apply formatting using Markdown syntax such as:
-    - Headings
-    - Bold text
-    - Bullet points
-    - Paragraph breaks
+MARKDOWN_DOC_BOUNDARY = "---DOC-BOUNDARY-{}---"
+MARKDOWN_DOC_BOUNDARY_PATTERN = re.compile(r"\s*---DOC-BOUNDARY-(\d+)---\s*")
 
-    Do not add or remove any words, punctuation, or content.
-    Do not include any explanation or commentary.
-    Only return the formatted Markdown.
+def convert_many_plain_text_to_markdown_with_ai(texts: list[str]) -> list[str]:
     """
-
-    prompt = f"""You are a Markdown formatter.
-    Convert the following job description into Markdown format:
-
-    ---
-    {text}
-    ---
+    Convert several plain texts to Markdown, sending up to config.MARKDOWN_BATCH_SIZE
+    of them per Gemini request. Returns one entry per input, in order; any text that
+    could not be converted (quota exceeded, API error, unparseable reply) is returned unchanged.
+    Cached conversions are returned without a Gemini request or quota check.
     """
+    results = list(texts)
+    cache_keys = {}
+    pending = []
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        cache_keys[i] = _markdown_cache_key(text)
+        try:
+            results[i] = _cached_markdown(cache_keys[i])
+        except KeyError:
+            pending.append(i)
+    if len(pending) < len(cache_keys):
+        logger.info("Reused cached Markdown for %d description(s).", len(cache_keys) - len(pending))
+
+    for batch_start in range(0, len(pending), config.MARKDOWN_BATCH_SIZE):
+        batch = pending[batch_start:batch_start + config.MARKDOWN_BATCH_SIZE]
+        logger.info("Converting %d description(s) to Markdown using Gemini Lite in one request...", len(batch))
+
+        # ✅ CHECK QUOTA BEFORE MAKING REQUEST
+        if not gemini_quota.acquire():
+            logger.warning("⚠️ Gemini quota exceeded. Returning plain text instead of Markdown.")
+            break  # Remaining texts stay as plain text
+
+        system_prompt = f"""
+        You are a Markdown formatter.
+        Your task is to convert plain text into well-structured Markdown.
+        You must not alter, paraphrase, or omit any part of the input text.
+        Only apply formatting using Markdown syntax such as:
+        - Headings
+        - Bold text
+        - Bullet points
+        - Paragraph breaks
+
+        Do not add or remove any words, punctuation, or content.
+        Do not include any explanation or commentary.
+        Only return the formatted Markdown.
+
+        The input contains several documents, each preceded by a marker line such as
+        {MARKDOWN_DOC_BOUNDARY.format(0)}. Format each document separately and keep every
+        marker line exactly as it appears, in the same order.
+        """
+
+        documents = "\n".join(
+            f"{MARKDOWN_DOC_BOUNDARY.format(doc_number)}\n{texts[i]}" for doc_number, i in enumerate(batch)
+        )
+        prompt = f"""You are a Markdown formatter.
+        Convert each of the following job descriptions into Markdown format:
+
+        {documents}
+        """
 
-    try: 
-        response = client.models.generate_content(
-            model=config.GEMINI_SECONDARY_MODEL_NAME,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                system_instruction=system_prompt,
-                temperature=0.2,
+        try:
+            response = client.models.generate_content(
+                model=config.GEMINI_SECONDARY_MODEL_NAME,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    system_instruction=system_prompt,
+                    temperature=0.2,
+                )
             )
-        )
-        markdown_content = response.text.strip()
-        
-        logging.info("Successfully converted text to Markdown.")
-        if not markdown_content:
-            logging.warning("Gemini returned empty markdown content for a non-empty input.") 
-            return text  # Return original text if conversion failed
-        return markdown_content
-    except Exception as e: 
-        logging.error(f"Error during Gemini Markdown conversion: {e}")
-        
-        # Decrement counter since request failed
-        state = load_quota_state()
-        state["daily_request_count"] = max(0, state["daily_request_count"] - 1)
-        
-        reset_date = state["daily_reset_date"]
-        if reset_date:
-            reset_date = datetime.fromisoformat(reset_date).date()
-        
-        timestamps = [datetime.fromisoformat(ts) for ts in state.get("request_timestamps", [])]
-        save_quota_state(state["daily_request_count"], reset_date, timestamps)
-        
-        return text  # Return original text on error
+        except Exception as e:
+            logger.error("Error during Gemini Markdown conversion: %s", e)
+
+            # Decrement counter since request failed
+            gemini_quota.rollback()
+            continue
+
+        # re.split yields [preamble, number, document, number, document, ...]
+        parts = MARKDOWN_DOC_BOUNDARY_PATTERN.split(response.text or "")
+        doc_numbers = [int(number) for number in parts[1::2]]
+        if doc_numbers != list(range(len(batch))):
+            logger.warning("Gemini returned %d document markers for %d inputs. Keeping plain text for this batch.", len(doc_numbers), len(batch))
+            continue
+
+        for i, markdown_content in zip(batch, parts[2::2]):
+            markdown_content = markdown_content.strip()
+            if markdown_content:
+                results[i] = markdown_content
+                markdown_disk_cache.set(cache_keys[i], markdown_content)
+            else:
+                logger.warning("Gemini returned empty markdown content for a non-empty input.")
+        logger.info("Successfully converted %d description(s) to Markdown.", len(batch))
+
+    return results
+
+def _convert_descriptions_to_markdown(job_details_list: list):
+    """Replaces the plain-text 'description' of each job dict with Markdown, batching the Gemini calls."""
+    jobs_with_description = [details for details in job_details_list if details and details.get('description')]
+    if not jobs_with_description:
+        return
+    markdown_descriptions = convert_many_plain_text_to_markdown_with_ai(
+        [details['description'] for details in jobs_with_description]
+    )
+    for details, markdown_description in zip(jobs_with_description, markdown_descriptions):
+        details['description'] = markdown_description
 
 def _get_careers_future_job_company_name(job_item: dict) -> str | None:
     """Helper to extract company name, preferring hiringCompany."""
@@ -225,294 +240,322 @@ def _get_careers_future_job_company_name(job_item: dict) -> str | None:
         
     return None
 
+# --- HTML Parsing Pool ---
+_parse_pool = None
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for CPU-bound page parsing, created on first use and shut down at exit.
+    __main__ creates it before any thread starts so the workers can be forked.
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        # A spawned worker re-imports this script, rebuilding every client, session and cache, before it
+        # can run linkedin_parser. Forked workers skip that, but forking is only safe while no other thread
+        # runs; a fork-context pool starts all its workers on the first submit, so that is done right away.
+        max_workers = min(config.PARSE_MAX_WORKERS, os.cpu_count() or 1)
+        if threading.active_count() == 1 and "fork" in multiprocessing.get_all_start_methods():
+            _parse_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+            _parse_pool.submit(int).result()
+        else:
+            _parse_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(_parse_pool.shutdown)
+    return _parse_pool
+
 # --- LinkedIn Scraping Logic ---
-def _fetch_linkedin_job_ids(search_query: str, location: str) -> list:
-    """Fetches job IDs from LinkedIn search results pages with delays, rotating user agents, and retries."""
+# Request-rate caps for LinkedIn. The search endpoint is stricter and fetched
+# synchronously, so it is paced by a plain token bucket.
+linkedin_search_bucket = TokenBucket(
+    capacity=config.LINKEDIN_SEARCH_MAX_RATE,
+    refill_rate=config.LINKEDIN_SEARCH_MAX_RATE / config.LINKEDIN_SEARCH_RATE_PERIOD,
+)
+_linkedin_detail_limiters = weakref.WeakKeyDictionary()
+
+def _get_loop_limiter(limiters: weakref.WeakKeyDictionary, max_rate: float, time_period: float) -> AsyncLimiter:
+    """The limiter in limiters for the running event loop (an AsyncLimiter must not be shared across loops)."""
+    loop = asyncio.get_running_loop()
+    limiter = limiters.get(loop)
+    if limiter is None:
+        limiter = AsyncLimiter(max_rate, time_period)
+        limiters[loop] = limiter
+    return limiter
+
+def _get_linkedin_detail_limiter() -> AsyncLimiter:
+    """Detail-request limiter for the running event loop."""
+    return _get_loop_limiter(_linkedin_detail_limiters, config.LINKEDIN_DETAIL_MAX_RATE, config.LINKEDIN_DETAIL_RATE_PERIOD)
+
+# Elements whose boundaries become line breaks in plain text; inline elements such as b or a stay on the line
+PLAIN_TEXT_BLOCK_TAGS = ("p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "div", "br", "ul", "ol", "tr", "blockquote", "pre", "dl", "dt", "dd")
+PLAIN_TEXT_CELL_TAGS = ("td", "th")  # Stay on their row's line, separated by a space
+WHITESPACE_RE = re.compile(r"\s+")
+
+def _html_to_plain_text(raw_html: str) -> str:
+    """
+    Text of an HTML fragment with one line per block element (p, li, h1-h6, div, br, ...).
+    Table cells in a row share one line. Whitespace within a line is collapsed and blank lines
+    are dropped. Empty input gives an empty string.
+
+    >>> _html_to_plain_text("<table><tr><th>Salary</th><td>$100k</td></tr><tr><td>Remote</td><td>Yes</td></tr></table>")
+    'Salary $100k\\nRemote Yes'
+    """
+    if not raw_html or not raw_html.strip():
+        return ""
+    fragment = lxml_html.fragment_fromstring(raw_html, create_parent="div")
+    # Newlines in the HTML source are ordinary whitespace; only block boundaries break lines
+    for element in fragment.iter():
+        if element.text:
+            element.text = WHITESPACE_RE.sub(" ", element.text)
+        if element.tail:
+            element.tail = WHITESPACE_RE.sub(" ", element.tail)
+    for element in fragment.iter(*PLAIN_TEXT_BLOCK_TAGS):
+        if element.tag != "br":
+            element.text = "\n" + (element.text or "")
+        element.tail = "\n" + (element.tail or "")
+    for element in fragment.iter(*PLAIN_TEXT_CELL_TAGS):
+        element.tail = " " + (element.tail or "")
+    lines = (WHITESPACE_RE.sub(" ", line).strip() for line in fragment.text_content().split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def _fetch_linkedin_job_ids(search_query: str, location: str, existing_ids: frozenset[str] | None = None) -> list:
+    """
+    Fetches job IDs from LinkedIn search results pages with rate limiting, rotating user agents, and retries.
+    Results are requested newest first (sortBy=DD), so when existing_ids is given pagination
+    stops at the first page whose jobs are all already known. existing_ids should be the IDs stored
+    before the run started, not a set that fills up as queries claim jobs.
+    """
 
     job_ids_list = []
+    seen_job_ids = set()  # Mirrors job_ids_list for O(1) duplicate checks
     start = 0
     max_start = config.LINKEDIN_MAX_START
 
 
-    logging.info(f"--- Starting Phase 1: Scraping Job IDs (Max Start: {max_start}) ---")
+    logger.info("--- Starting Phase 1: Scraping Job IDs (Max Start: %s) ---", max_start)
     while start <= max_start:
-        target_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={search_query.replace(' ', '%2B')}&location={location}&geoId={config.LINKEDIN_GEO_ID}&f_TPR={config.LINKEDIN_JOB_POSTING_DATE}&f_JT={config.LINKEDIN_JOB_TYPE}&f_WT={config.LINKEDIN_F_WT}&start={start}"
+        target_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={search_query.replace(' ', '%2B')}&location={location}&geoId={config.LINKEDIN_GEO_ID}&f_TPR={config.LINKEDIN_JOB_POSTING_DATE}&f_JT={config.LINKEDIN_JOB_TYPE}&f_WT={config.LINKEDIN_F_WT}&sortBy=DD&start={start}"
 
-        sleep_time = random.uniform(5.0, 15.0)
-    
-        logging.info(f"Waiting for {sleep_time:.2f} seconds before next request...")
-        time.sleep(sleep_time)
+        acquired, wait_time = linkedin_search_bucket.try_acquire()
+        while not acquired:
+            logger.debug("Waiting for %.2f seconds before next request...", wait_time)
+            time.sleep(wait_time)
+            acquired, wait_time = linkedin_search_bucket.try_acquire()
 
         user_agent = random.choice(user_agents.USER_AGENTS)
-        headers = {'User-Agent': user_agent}
+        linkedin_session.headers['User-Agent'] = user_agent
     
-        logging.info(f"Using User-Agent: {user_agent}")
+        logger.debug("Using User-Agent: %s", user_agent)
 
     
-        logging.info(f"Scraping URL: {target_url}")
+        logger.debug("Scraping URL: %s", target_url)
 
-        res = None 
-        retries = 0
-        while retries <= config.MAX_RETRIES:
-            try:
-                res = requests.get(target_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
-                res.raise_for_status()
-                break
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429 and retries < config.MAX_RETRIES:
-                    retries += 1
-                    wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5) 
-                    
-                    logging.warning(f"Error 429: Too Many Requests. Retrying attempt {retries}/{config.MAX_RETRIES} after {wait_time:.2f} seconds...")
-                    time.sleep(wait_time)
-
-                    user_agent = random.choice(user_agents.USER_AGENTS)
-                    headers = {'User-Agent': user_agent}
-                
-                    logging.info(f"Retrying with new User-Agent: {user_agent}")
-                    continue
-                else:
-                    
-                    logging.error(f"HTTP Error fetching search results page: {e}")
-                    res = None 
-                    break
-            except requests.exceptions.RequestException as e:
-                
-                logging.error(f"Request Exception fetching search results page: {e}")
-                res = None
-                break
+        # 429s and 5xx are retried by the session's adapter
+        attempts = 1
+        try:
+            res = linkedin_session.get(target_url, timeout=config.REQUEST_TIMEOUT)
+            res.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            # Once retries run out the adapter returns the last response; its Retry history holds the earlier tries
+            retries = getattr(e.response.raw, "retries", None)
+            attempts += len(retries.history) if retries else 0
+            logger.error("HTTP Error fetching search results page: %s", e)
+            res = None 
+        except requests.exceptions.RequestException as e:
+            # MaxRetryError means every retry was spent; other errors are raised on the first try
+            if e.args and isinstance(e.args[0], MaxRetryError):
+                attempts += config.MAX_RETRIES
+            logger.error("Request Exception fetching search results page: %s", e)
+            res = None
 
         
         if res is None:
-            logging.error(f"Failed to fetch {target_url} after {retries} retries. Stopping pagination for this query.")
+            logger.error("Failed to fetch %s after %d attempt(s). Stopping pagination for this query.", target_url, attempts)
             break 
 
-        if not res.text:
+        if not res.content.strip():
             
-             logging.info(f"Received empty response text at start={start}, stopping.")
+             logger.info("Received empty response text at start=%s, stopping.", start)
              break
 
-        soup = BeautifulSoup(res.text, 'html.parser')
-        all_jobs_on_this_page = soup.find_all('li')
+        # One query straight to the job cards instead of scanning every <li> for a card
+        job_urns_on_this_page = linkedin_parser.XPATH_JOB_URN(lxml_html.fromstring(res.content, parser=linkedin_parser.LINKEDIN_HTML_PARSER))
 
-        if not all_jobs_on_this_page:
+        if not job_urns_on_this_page:
             
-             logging.info(f"No job listings ('li' elements) found on page at start={start}, stopping.")
+             logger.info("No job cards found on page at start=%s, stopping.", start)
              break
 
     
-        logging.info(f"Found {len(all_jobs_on_this_page)} potential job elements on this page.")
+        logger.debug("Found %d potential job elements on this page.", len(job_urns_on_this_page))
 
         jobs_found_this_iteration = 0
-        for job_element in all_jobs_on_this_page:
-            base_card = job_element.find("div", {"class": "base-card"})
-            job_urn = base_card.get('data-entity-urn') if base_card else None
-            if job_urn and 'jobPosting:' in job_urn:
-                try:
-                    jobid = job_urn.split(":")[3]
-                    if jobid not in job_ids_list:
-                         job_ids_list.append(jobid)
-                         jobs_found_this_iteration += 1
-                except IndexError:
-                    
-                    logging.warning(f"Could not parse job ID from URN: {job_urn}")
-                    pass
+        unknown_jobs_this_iteration = 0
+        for job_urn in job_urns_on_this_page:
+            match = linkedin_parser.JOB_URN_RE.search(job_urn)
+            if not match:
+                logger.warning("Could not parse job ID from URN: %s", job_urn)
+                continue
+            jobid = match.group(1)
+            if existing_ids is not None and jobid not in existing_ids:
+                unknown_jobs_this_iteration += 1
+            if jobid not in seen_job_ids:
+                 seen_job_ids.add(jobid)
+                 job_ids_list.append(jobid)
+                 jobs_found_this_iteration += 1
 
     
-        logging.info(f"Added {jobs_found_this_iteration} unique job IDs from this page.")
+        logger.debug("Added %d unique job IDs from this page.", jobs_found_this_iteration)
 
-        if jobs_found_this_iteration == 0 and len(all_jobs_on_this_page) > 0:
+        if jobs_found_this_iteration == 0:
         
-            logging.info("Found list items but no new job IDs extracted, potentially end of relevant results or parsing issue.")
+            logger.info("Found job cards but no new job IDs extracted, potentially end of relevant results or parsing issue.")
+            break
+
+        if existing_ids is not None and unknown_jobs_this_iteration == 0:
+            logger.info("All job IDs on the page at start=%s are already in Supabase, stopping.", start)
             break
 
         start += 10
 
 
-    logging.info(f"--- Finished Phase 1: Found {len(job_ids_list)} unique job IDs during scraping ---")
+    logger.info("--- Finished Phase 1: Found %d unique job IDs during scraping ---", len(job_ids_list))
     return job_ids_list
 
-def _fetch_linkedin_job_details(job_id: str) -> dict | None:
-    """Fetches detailed information for a single job ID with delays, rotating user agents, and retries."""
+async def _fetch_linkedin_job_details(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, job_id: str) -> dict | None:
+    """
+    Fetches detailed information for a single job ID with rate limiting, rotating user agents, and retries.
+    At most one request per semaphore slot is in flight, and requests start no faster than
+    config.LINKEDIN_DETAIL_MAX_RATE per config.LINKEDIN_DETAIL_RATE_PERIOD. The description is returned as plain text.
+    """
 
     job_detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
 
-    logging.info(f"Preparing to fetch details for job ID: {job_id}")
+    async with semaphore:
+        logger.debug("Preparing to fetch details for job ID: %s", job_id)
 
-    sleep_time = random.uniform(3.0, 10.0)
-
-    logging.info(f"Waiting for {sleep_time:.2f} seconds before fetching details...")
-    time.sleep(sleep_time)
-
-    user_agent = random.choice(user_agents.USER_AGENTS)
-    headers = {'User-Agent': user_agent}
+        user_agent = random.choice(user_agents.USER_AGENTS)
+        headers = {'User-Agent': user_agent}
 
-    logging.info(f"Using User-Agent for details: {user_agent}")
+        logger.debug("Using User-Agent for details: %s", user_agent)
 
 
-    logging.info(f"Fetching details from: {job_detail_url}")
+        logger.debug("Fetching details from: %s", job_detail_url)
 
-    resp = None 
-    retries = 0
-    while retries <= config.MAX_RETRIES:
-        try:
-            resp = requests.get(job_detail_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            break
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429 and retries < config.MAX_RETRIES:
-                retries += 1
-                wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5) 
+        resp = None 
+        retries = 0
+        while retries <= config.MAX_RETRIES:
+            try:
+                async with _get_linkedin_detail_limiter():
+                    resp = await client.get(job_detail_url, headers=headers)
+                resp.raise_for_status()
+                break
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429 and retries < config.MAX_RETRIES:
+                    retries += 1
+                    wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5) 
+                    
+                    logger.warning("Error 429 for job ID %s. Retrying attempt %s/%s after %.1f seconds...", job_id, retries, config.MAX_RETRIES, wait_time)
+                    await asyncio.sleep(wait_time)
+                    user_agent = random.choice(user_agents.USER_AGENTS)
+                    headers = {'User-Agent': user_agent}
                 
-                logging.warning(f"Error 429 for job ID {job_id}. Retrying attempt {retries}/{config.MAX_RETRIES} after {wait_time:.1f} seconds...")
-                time.sleep(wait_time)
-                user_agent = random.choice(user_agents.USER_AGENTS)
-                headers = {'User-Agent': user_agent}
-            
-                logging.info(f"Retrying job {job_id} with new User-Agent: {user_agent}")
-                continue
-            else:
+                    logger.debug("Retrying job %s with new User-Agent: %s", job_id, user_agent)
+                    continue
+                else:
+                    
+                    logger.error("HTTP Error fetching details for job ID %s: %s", job_id, e)
+                    return None
+            except httpx.RequestError as e:
                 
-                logging.error(f"HTTP Error fetching details for job ID {job_id}: {e}")
-                return None
-        except requests.exceptions.RequestException as e:
-            
-            logging.error(f"Request Exception fetching details for job ID {job_id}: {e}")
-            return None 
+                logger.error("Request Exception fetching details for job ID %s: %s", job_id, e)
+                return None 
 
     
     if resp is None:
-         logging.error(f"Failed to fetch details for job ID {job_id} after {retries} retries (unexpected state).")
+         logger.error("Failed to fetch details for job ID %s after %s retries (unexpected state).", job_id, retries)
          return None
 
-    try:
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        job_details = {"job_id": job_id}
-
-        # --- Extract Company ---
-        try:
-            company_img = soup.find("div",{"class":"top-card-layout__card"}).find("a").find("img")
-            if company_img:
-                job_details["company"] = company_img.get('alt').strip()
-            if not job_details.get("company"):
-                 company_link = soup.find("a", {"class": "topcard__org-name-link"})
-                 if company_link:
-                      job_details["company"] = company_link.text.strip()
-                 else:
-                      sub_title_span = soup.find("span", {"class": "topcard__flavor"})
-                      if sub_title_span:
-                           job_details["company"] = sub_title_span.text.strip()
-
-            if not job_details.get("company"):
-                 job_details["company"] = None
-                 print(f"Warning: Could not extract company for job ID {job_id}")
-        except Exception as e:
-            print(f"Error extracting company for job ID {job_id}: {e}")
-            job_details["company"] = None
-
-        # --- Extract Job Title ---
-        try:
-            title_link = soup.find("div",{"class":"top-card-layout__entity-info"}).find("a")
-            job_details["job_title"] = title_link.text.strip() if title_link else None
-            if not job_details["job_title"]:
-                 title_h1 = soup.find("h1", {"class": "top-card-layout__title"})
-                 if title_h1:
-                      job_details["job_title"] = title_h1.text.strip()
-        except Exception as e: 
-            print(f"Error extracting job title for job ID {job_id}: {e}")
-            job_details["job_title"] = None
-
-        # --- Extract Seniority Level ---
-        try:
-            # Find all criteria items
-            criteria_items = soup.find("ul",{"class":"description__job-criteria-list"}).find_all("li")
-            job_details["level"] = None 
-            for item in criteria_items:
-                header = item.find("h3", {"class": "description__job-criteria-subheader"})
-                if header and "Seniority level" in header.text:
-                    level_text = item.find("span", {"class": "description__job-criteria-text"})
-                    if level_text:
-                        job_details["level"] = level_text.text.strip()
-                        break 
-        except Exception as e: 
-            print(f"Error extracting seniority level for job ID {job_id}: {e}")
-            job_details["level"] = None
-
-        # --- Extract Location ---
-        try:
-           
-            location_span = soup.find("span", {"class": "topcard__flavor topcard__flavor--bullet"})
-            if location_span:
-                job_details["location"] = location_span.text.strip()
-            else:
-                
-                subtitle_div = soup.find("div", {"class": "topcard__flavor-row"})
-                if subtitle_div:
-                    location_span_fallback = subtitle_div.find("span", {"class": "topcard__flavor"})
-                    if location_span_fallback:
-                         job_details["location"] = location_span_fallback.text.strip()
-
-            if not job_details.get("location"): 
-                 job_details["location"] = None
-                 print(f"Warning: Could not extract location for job ID {job_id}")
-        except Exception as e:
-            print(f"Error extracting location for job ID {job_id}: {e}")
-            job_details["location"] = None
-
-        # --- Extract Description ---
-        raw_description_text = "" 
-        try:
-            description_div = soup.find("div", {"class": "show-more-less-html__markup"})
-            if description_div:
-                raw_description_text = description_div.get_text(separator='\n', strip=True)
-                lines = [line for line in raw_description_text.splitlines() if line.strip()]
-                raw_description_text = "\n".join(lines)
-            else:
-                
-                logging.warning(f"Could not find description div for job ID {job_id}")
-                
-        except Exception as e:
-                
-                logging.error(f"Error extracting raw description for job ID {job_id}: {e}")
-                raw_description_text = "" 
-
-        
-        if raw_description_text.strip():
-            job_details["description"] = convert_plain_text_to_markdown_with_ai(raw_description_text)
-        else:
-            job_details["description"] = None 
-            logging.warning(f"Raw description was empty for job ID {job_id}. Skipping AI conversion.") 
-
-        # --- Set Provider ---
-        job_details["provider"] = "linkedin"
-        
-        return job_details
+    # Parse in a worker process so parsing runs on all cores and the event loop keeps other fetches moving
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_parse_pool(), linkedin_parser.parse_job_details, job_id, resp.content)
 
-    except Exception as e:
-         
-         logging.error(f"General Error processing details for job ID {job_id} after successful fetch: {e}")
-         return None
+async def _gather_job_details(fetch_details, job_ids: list) -> list:
+    """
+    Runs fetch_details(client, semaphore, job_id) for every job ID concurrently over one pooled client,
+    with at most config.DETAIL_FETCH_CONCURRENCY fetches in flight.
+    Returns results in job_ids order; a fetch that raised yields its exception.
+    """
+    semaphore = asyncio.Semaphore(config.DETAIL_FETCH_CONCURRENCY)
+    limits = httpx.Limits(max_connections=config.DETAIL_FETCH_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(limits=limits, timeout=config.REQUEST_TIMEOUT) as client:
+        tasks = [fetch_details(client, semaphore, job_id) for job_id in job_ids]
+        return await asyncio.gather(*tasks, return_exceptions=True)
 
-def process_linkedin_query(search_query: str, location: str) -> list:
+def _iter_new_job_details(fetch_details, job_ids: list, batch_size: int = config.SAVE_BATCH_SIZE) -> Iterator[list]:
+    """
+    Fetches details for job_ids batch_size IDs at a time, converting descriptions to Markdown,
+    and yields each batch's jobs that have a description and a job_id.
+    Only one batch of full descriptions is held in memory at once.
+    """
+    for start in range(0, len(job_ids), batch_size):
+        batch_ids = job_ids[start:start + batch_size]
+        fetched_details = asyncio.run(_gather_job_details(fetch_details, batch_ids))
+        for job_id, details in zip(batch_ids, fetched_details):
+            if isinstance(details, Exception):
+                logger.error("Exception fetching details for job ID %s: %s", job_id, details)
+        fetched_details = [None if isinstance(details, Exception) else details for details in fetched_details]
+
+        # Markdown conversion waits on the Gemini quota, so it runs here rather than inside the event loop
+        _convert_descriptions_to_markdown(fetched_details)
+
+        # Skips are reported as one count per batch rather than one warning per job
+        detailed_new_jobs = [
+            details for details in fetched_details
+            if details and (details.get('description') or '').strip() and details.get('job_id') is not None
+        ]
+        skipped_count = len(batch_ids) - len(detailed_new_jobs)
+        if skipped_count:
+            logger.warning("Skipped %d job(s) with failed detail fetches, empty descriptions, or no job_id.", skipped_count)
+
+        if detailed_new_jobs:
+            yield detailed_new_jobs
+
+def _remember_saved_jobs(existing_jobs: tuple[set, set, frozenset], saved_jobs: list):
+    """
+    Adds saved jobs to the live (job_ids, company_title_keys) sets from _load_existing_jobs,
+    so later queries in the same run skip them without re-reading Supabase.
+    """
+    job_ids_set, company_title_set, _ = existing_jobs
+    for job in saved_jobs:
+        if job.get('job_id'):
+            job_ids_set.add(str(job['job_id']))
+        if job.get('company') and job.get('job_title'):
+            company_title_set.add((job['company'].strip().casefold(), job['job_title'].strip().casefold()))
+
+def process_linkedin_query(search_query: str, location: str, existing_jobs: tuple[set, set, frozenset] | None = None) -> Iterator[list]:
     """
     Orchestrates scraping and detail fetching for a single query,
     filtering against existing jobs in Supabase BEFORE fetching details.
-    Returns a list of new job details found.
+    existing_jobs is the result of _load_existing_jobs(); it is fetched when not given.
+    Yields the new job details found in lists of at most config.SAVE_BATCH_SIZE.
     """
 
-    scraped_job_ids = _fetch_linkedin_job_ids(search_query, location)
+    if existing_jobs is None:
+        existing_jobs = _load_existing_jobs()
+    job_ids_set, company_title_set, supabase_job_ids = existing_jobs
+
+    # Pagination stops once a page has nothing new. It checks the pre-run Supabase snapshot: the live set
+    # also holds IDs claimed by earlier queries this run, which would stop an overlapping query at page 0.
+    scraped_job_ids = _fetch_linkedin_job_ids(search_query, location, supabase_job_ids)
     if not scraped_job_ids:
     
-        logging.info("No job IDs found in Phase 1. Skipping detail fetching.")
-        return []
-
-    unique_linkedin_job_ids = list(set(scraped_job_ids))
+        logger.info("No job IDs found in Phase 1. Skipping detail fetching.")
+        return
 
-    logging.info(f"Found {len(scraped_job_ids)} raw job IDs, {len(unique_linkedin_job_ids)} unique IDs after scraping.")
+    # _fetch_linkedin_job_ids already drops duplicates
+    unique_linkedin_job_ids = scraped_job_ids
 
 
-    logging.info("\n--- Starting Filtering Step: Checking against Supabase ---")
-    job_ids_set, company_title_set = supabase_utils.get_existing_jobs_from_supabase()
+    logger.info("\n--- Starting Filtering Step: Checking against Supabase ---")
 
     new_job_ids_to_process = [
         str(job_id) for job_id in unique_linkedin_job_ids 
@@ -520,45 +563,59 @@ def process_linkedin_query(search_query: str, location: str) -> list:
     ]
 
 
-    logging.info(f"Found {len(unique_linkedin_job_ids)} unique scraped IDs.")
+    logger.info("Found %d unique scraped IDs.", len(unique_linkedin_job_ids))
 
-    logging.info(f"Found {len(job_ids_set)} existing IDs in Supabase.")
+    logger.info("Found %d existing IDs in Supabase.", len(job_ids_set))
 
-    logging.info(f"Identified {len(new_job_ids_to_process)} new job IDs to fetch details for.")
+    logger.info("Identified %d new job IDs to fetch details for.", len(new_job_ids_to_process))
 
     if not new_job_ids_to_process:
     
-        logging.info("No new job IDs to process after filtering.")
-        return []
+        logger.info("No new job IDs to process after filtering.")
+        return
 
 
-    logging.info(f"\n--- Starting Phase 2: Fetching Job Details for {len(new_job_ids_to_process)} New IDs ---")
-    detailed_new_jobs = []
+    logger.info("\n--- Starting Phase 2: Fetching Job Details for %d New IDs ---", len(new_job_ids_to_process))
+    # Claim the IDs in the shared set so overlapping queries later in the run don't fetch them again
+    job_ids_set.update(new_job_ids_to_process)
+
     processed_count = 0
+    for detailed_new_jobs in _iter_new_job_details(_fetch_linkedin_job_details, new_job_ids_to_process):
+        processed_count += len(detailed_new_jobs)
+        yield detailed_new_jobs
 
-    ids_to_fetch = new_job_ids_to_process
+    logger.info("--- Finished Phase 2: Successfully fetched details for %d new job(s) ---", processed_count)
 
-    for job_id in ids_to_fetch:
-        details = _fetch_linkedin_job_details(job_id)
-        if details:
-            description = details.get('description')
-            if description and description.strip(): 
-                if 'job_id' in details and details['job_id'] is not None:
-                    detailed_new_jobs.append(details)
-                    processed_count += 1
-                else:
-                    
-                    logging.warning(f"Fetched details for {job_id} but missing 'job_id' key. Skipping.")
-            else:
-                
-                logging.warning(f"Skipping job ID {job_id} due to missing or empty description.") 
-        else:
-            
-            logging.warning(f"Skipping job ID {job_id} as detail fetching failed or returned no data.") 
+CAREERS_FUTURE_PAGE_SIZE = 100
+# Search pages and job details come from the same API host, so they share one request-rate cap
+_careers_future_limiters = weakref.WeakKeyDictionary()
+
+def _get_careers_future_limiter() -> AsyncLimiter:
+    """CareersFuture API limiter for the running event loop."""
+    return _get_loop_limiter(_careers_future_limiters, config.CAREERS_FUTURE_MAX_RATE, config.CAREERS_FUTURE_RATE_PERIOD)
 
+def _json(response):
+    """Decode a requests/httpx response body with orjson. Decode errors are json.JSONDecodeError subclasses."""
+    return orjson.loads(response.content)
 
-    logging.info(f"--- Finished Phase 2: Successfully fetched details for {processed_count} new job(s) ---")
-    return detailed_new_jobs
+async def _fetch_careers_future_search_page(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str, search_payload: dict) -> list:
+    """POSTs one CareersFuture search page and returns its job items. Errors propagate to the caller."""
+    async with semaphore, _get_careers_future_limiter():
+        logger.debug("Job search API call: POST to %s", url)
+        response = await client.post(url, json=search_payload)
+    response.raise_for_status()
+    return _json(response).get('results', [])
+
+async def _gather_careers_future_search_pages(page_urls: list, search_payload: dict) -> list:
+    """
+    Fetches all given search pages concurrently.
+    Returns one entry per URL, in order: the page's job items, or the exception it raised.
+    """
+    semaphore = asyncio.Semaphore(config.DETAIL_FETCH_CONCURRENCY)
+    limits = httpx.Limits(max_connections=config.DETAIL_FETCH_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(limits=limits, timeout=config.REQUEST_TIMEOUT) as client:
+        tasks = [_fetch_careers_future_search_page(client, semaphore, url, search_payload) for url in page_urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
 
 def _fetch_careers_future_jobs(search_query: str) -> list:
     """
@@ -566,7 +623,8 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
     This involves:
     1. Getting skill suggestions based on the search query.
     2. Using these skill UUIDs to search for jobs.
-    3. Handling pagination to retrieve all job results.
+    3. Handling pagination to retrieve all job results. Once the first page reports
+       the total, the remaining pages are requested concurrently.
     4. Returning a list of all collected job item dictionaries.
 
     Args:
@@ -587,34 +645,34 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
     skills_suggestions_payload = {'jobTitle': search_query}
 
     try:
-        logging.info(f"Fetching skill suggestions for query: '{search_query}' from {careers_future_suggestions_api_url}")
-        skills_suggestions_response = requests.post(
+        logger.info("Fetching skill suggestions for query: '%s' from %s", search_query, careers_future_suggestions_api_url)
+        skills_suggestions_response = careers_future_session.post(
             careers_future_suggestions_api_url, 
             data=skills_suggestions_payload,
             timeout=config.REQUEST_TIMEOUT
             )
 
         skills_suggestions_response.raise_for_status()
-        skills_data = skills_suggestions_response.json()
+        skills_data = _json(skills_suggestions_response)
         skills_list = skills_data.get('skills', [])
         skillUuids = [skill_dict['uuid'] for skill_dict in skills_list if 'uuid' in skill_dict]
-        logging.info(f"Successfully retrieved {len(skillUuids)} skill UUIDs for '{search_query}'.")
+        logger.info("Successfully retrieved %d skill UUIDs for '%s'.", len(skillUuids), search_query)
         if not skillUuids:
-            logging.warning(f"No skill UUIDs found for query '{search_query}'. Job search will proceed without specific skill filtering.")
+            logger.warning("No skill UUIDs found for query '%s'. Job search will proceed without specific skill filtering.", search_query)
 
 
     except requests.exceptions.HTTPError as http_err:
         status_code = http_err.response.status_code if http_err.response is not None else 'N/A'
         response_text = http_err.response.text if http_err.response is not None else 'N/A'
-        logging.error(f"HTTP error during skill suggestions: {http_err} - Status: {status_code}")
-        logging.debug(f"Skill suggestions error response content: {response_text[:500]}") 
+        logger.error("HTTP error during skill suggestions: %s - Status: %s", http_err, status_code)
+        logger.debug("Skill suggestions error response content: %.500s", response_text) 
         return []
     except requests.exceptions.RequestException as req_err: 
-        logging.error(f"Request exception during skill suggestions: {req_err}")
+        logger.error("Request exception during skill suggestions: %s", req_err)
         return []
     except json.JSONDecodeError:
         content_for_log = skills_suggestions_response.text if 'skills_suggestions_response' in locals() and skills_suggestions_response else "N/A"
-        logging.error(f"Could not decode JSON response for skill suggestions. Content: {content_for_log[:500]}")
+        logger.error("Could not decode JSON response for skill suggestions. Content: %.500s", content_for_log)
         return []
 
     # --- 2. Search for Jobs and Handle Pagination ---
@@ -622,7 +680,7 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
     total_api_calls_for_search = 0
 
     # Initial search URL with default limit and page
-    current_search_url = f"{careers_future_search_api_base_url}?limit=100&page=0"
+    current_search_url = f"{careers_future_search_api_base_url}?limit={CAREERS_FUTURE_PAGE_SIZE}&page=0"
     search_payload = {
         'sessionId':"",
         'search': search_query,
@@ -635,58 +693,97 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
     }
 
     try:
+        # The first page tells us how many results there are in total
+        total_api_calls_for_search += 1
+        logger.info("Job search API call %s: POST to %s", total_api_calls_for_search, current_search_url)
+
+        search_response = careers_future_session.post(current_search_url, json=search_payload, timeout=config.REQUEST_TIMEOUT)
+        search_response.raise_for_status()
+        search_results_data  = _json(search_response)
+
+        current_page_jobs = search_results_data.get('results', [])
+        all_job_items.extend(current_page_jobs)
+        logger.info("Retrieved %d job items from this page. Total items collected: %d.", len(current_page_jobs), len(all_job_items))
+
+        total_jobs = search_results_data.get('total')
+        if isinstance(total_jobs, int):
+            logger.info("API reports total potential jobs matching criteria: %s", total_jobs)
+            page_count = math.ceil(total_jobs / CAREERS_FUTURE_PAGE_SIZE)
+            page_urls = [
+                f"{careers_future_search_api_base_url}?limit={CAREERS_FUTURE_PAGE_SIZE}&page={page}"
+                for page in range(1, page_count)
+            ]
+            if page_urls:
+                logger.info("Fetching the remaining %d job pages concurrently.", len(page_urls))
+                total_api_calls_for_search += len(page_urls)
+                page_results = asyncio.run(_gather_careers_future_search_pages(page_urls, search_payload))
+                # Merge in page order so results keep the API's sort
+                for page_url, page_jobs in zip(page_urls, page_results):
+                    if isinstance(page_jobs, Exception):
+                        logger.error("Error fetching job search page %s: %s", page_url, page_jobs)
+                        continue
+                    all_job_items.extend(page_jobs)
+                logger.info("Total items collected: %d.", len(all_job_items))
+            else:
+                logger.info("No more job pages to fetch.")
+            current_search_url = None
+        else:
+            # Without a total, fall back to following the API's next links one page at a time
+            next_page_link_info = search_results_data.get("_links", {}).get("next", {})
+            current_search_url = next_page_link_info.get("href") if next_page_link_info else None
+
         while current_search_url:
             total_api_calls_for_search += 1
-            logging.info(f"Job search API call {total_api_calls_for_search}: POST to {current_search_url}")
+            logger.debug("Job search API call %d: POST to %s", total_api_calls_for_search, current_search_url)
         
-            search_response = requests.post(current_search_url, json=search_payload)
+            search_response = careers_future_session.post(current_search_url, json=search_payload, timeout=config.REQUEST_TIMEOUT)
             search_response.raise_for_status()
-            search_results_data  = search_response.json()
+            search_results_data  = _json(search_response)
 
             current_page_jobs = search_results_data.get('results', [])
             all_job_items.extend(current_page_jobs)
 
-            logging.info(f"Retrieved {len(current_page_jobs)} job items from this page. Total items collected: {len(all_job_items)}.")
-
-            # Log total results reported by API 
-            if 'total' in search_results_data and total_api_calls_for_search == 1:
-                logging.info(f"API reports total potential jobs matching criteria: {search_results_data['total']}")
+            logger.debug("Retrieved %d job items from this page. Total items collected: %d.", len(current_page_jobs), len(all_job_items))
             
             # Get the next page URL. The API provides a full URL.
             next_page_link_info = search_results_data.get("_links", {}).get("next", {})
             current_search_url = next_page_link_info.get("href") if next_page_link_info else None 
 
             if current_search_url:
-                logging.debug(f"Next page URL for job search: {current_search_url}")
+                logger.debug("Next page URL for job search: %s", current_search_url)
             else:
-                logging.info("No more job pages to fetch.")
+                logger.info("No more job pages to fetch.")
 
-        logging.info(f"Completed job search. Total API calls made for search: {total_api_calls_for_search}.")
+        logger.info("Completed job search. Total API calls made for search: %s.", total_api_calls_for_search)
     
     except requests.exceptions.HTTPError as http_err:
         status_code = http_err.response.status_code if http_err.response is not None else 'N/A'
         response_text = http_err.response.text if http_err.response is not None else 'N/A'
-        logging.error(f"HTTP error during job search: {http_err} - Status: {status_code}")
-        logging.debug(f"Job search error response content: {response_text[:500]}")
+        logger.error("HTTP error during job search: %s - Status: %s", http_err, status_code)
+        logger.debug("Job search error response content: %.500s", response_text)
     except requests.exceptions.RequestException as req_err:
-        logging.error(f"Request exception during job search: {req_err}")
+        logger.error("Request exception during job search: %s", req_err)
     except json.JSONDecodeError:
         content_for_log = search_response.text if 'search_response' in locals() and search_response else "N/A"
-        logging.error(f"Could not decode JSON response during job search. Content: {content_for_log[:500]}")
+        logger.error("Could not decode JSON response during job search. Content: %.500s", content_for_log)
 
     # --- 3. Return all collected job items ---
     if not all_job_items:
-        logging.info(f"No job items were collected for query '{search_query}'.")
+        logger.info("No job items were collected for query '%s'.", search_query)
         return [] 
 
-    logging.info(f"Returning {len(all_job_items)} total job items for query '{search_query}'.")
+    logger.info("Returning %d total job items for query '%s'.", len(all_job_items), search_query)
     return all_job_items
 
-def _fetch_careers_future_job_details(job_id: str) -> dict | None:
+async def _fetch_careers_future_job_details(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, job_id: str) -> dict | None:
     """
     Fetch job details from CareersFuture based on the provided job ID.
+    Requests start no faster than config.CAREERS_FUTURE_MAX_RATE per config.CAREERS_FUTURE_RATE_PERIOD.
+    The description is returned as plain text.
 
     Args:
+        client (httpx.AsyncClient): Pooled client shared by all detail fetches.
+        semaphore (asyncio.Semaphore): Bounds the number of concurrent requests.
         job_id (str): The UUID of the job to fetch details for.
 
     Returns:
@@ -694,29 +791,30 @@ def _fetch_careers_future_job_details(job_id: str) -> dict | None:
                       None otherwise.
     """
     if not job_id:
-        logging.warning("Job ID is missing or empty. Cannot fetch details.")
+        logger.warning("Job ID is missing or empty. Cannot fetch details.")
         return None
 
     api_url = f"https://api.mycareersfuture.gov.sg/v2/jobs/{job_id}"
     
-    logging.info(f"Attempting to fetch job details for ID: {job_id} from URL: {api_url}")
+    logger.debug("Attempting to fetch job details for ID: %s from URL: %s", job_id, api_url)
 
     try:
-        response = requests.get(api_url, timeout=config.REQUEST_TIMEOUT) 
+        async with semaphore, _get_careers_future_limiter():
+            response = await client.get(api_url)
 
         response.raise_for_status()
 
-        job_data = response.json()
-        logging.info(f"Successfully fetched and parsed job details for ID: {job_id}")
+        job_data = _json(response)
+        logger.debug("Successfully fetched and parsed job details for ID: %s", job_id)
 
         raw_description_html = job_data.get('description', '')
-        # Convert HTML description to plain text then Markdown
-        plain_text_description = html2text.html2text(raw_description_html)
-        markdown_description = None 
+        # Convert HTML description to plain text; Markdown conversion happens once all details are in
+        plain_text_description = _html_to_plain_text(raw_description_html)
+        description = None 
         if plain_text_description.strip(): 
-            markdown_description = convert_plain_text_to_markdown_with_ai(plain_text_description)
+            description = plain_text_description
         else:
-            logging.warning(f"Raw description was empty for Careers Future job ID {job_id}. Skipping AI conversion.") 
+            logger.warning("Raw description was empty for Careers Future job ID %s. Skipping AI conversion.", job_id) 
 
         job_details = {
             'job_id': job_data.get('uuid'),
@@ -725,164 +823,257 @@ def _fetch_careers_future_job_details(job_id: str) -> dict | None:
             'location': 'Singapore',
             'level': job_data.get('positionLevels', [{'position': 'Not applicable'}])[0].get('position', 'Not applicable'),
             'provider': 'careers_future',
-            'description': markdown_description, 
+            'description': description, 
             'posted_at': job_data.get('metadata', {}).get('createdAt', ''),
         }
 
         return job_details
 
-    except requests.exceptions.HTTPError as http_err:
-        status_code = http_err.response.status_code if http_err.response is not None else 'N/A'
-        response_text = http_err.response.text if http_err.response is not None else 'N/A'
+    except httpx.HTTPStatusError as http_err:
+        status_code = http_err.response.status_code
+        response_text = http_err.response.text
         if status_code == 404:
-            logging.warning(f"Job details not found (404) for ID: {job_id} at {api_url}.")
+            logger.warning("Job details not found (404) for ID: %s at %s.", job_id, api_url)
         else:
-            logging.error(f"HTTP error occurred while fetching job details for ID '{job_id}': {http_err} - Status: {status_code}")
-            logging.debug(f"Error response content: {response_text[:500]}") 
-    except requests.exceptions.ConnectionError as conn_err:
-        logging.error(f"Connection error occurred while fetching job details for ID '{job_id}': {conn_err}")
-    except requests.exceptions.Timeout as timeout_err:
-        logging.error(f"Timeout error occurred while fetching job details for ID '{job_id}': {timeout_err}")
-    except requests.exceptions.RequestException as req_err: 
-        logging.error(f"An error occurred during the request for job details for ID '{job_id}': {req_err}")
+            logger.error("HTTP error occurred while fetching job details for ID '%s': %s - Status: %s", job_id, http_err, status_code)
+            logger.debug("Error response content: %.500s", response_text) 
+    except httpx.ConnectError as conn_err:
+        logger.error("Connection error occurred while fetching job details for ID '%s': %s", job_id, conn_err)
+    except httpx.TimeoutException as timeout_err:
+        logger.error("Timeout error occurred while fetching job details for ID '%s': %s", job_id, timeout_err)
+    except httpx.RequestError as req_err: 
+        logger.error("An error occurred during the request for job details for ID '%s': %s", job_id, req_err)
     except json.JSONDecodeError:
         content_for_log = response.text if 'response' in locals() and response else "N/A"
-        logging.error(f"Failed to decode JSON response for job details for ID '{job_id}'. Content: {content_for_log[:500]}")
+        logger.error("Failed to decode JSON response for job details for ID '%s'. Content: %.500s", job_id, content_for_log)
     
     return None # Return None in case of any error
 
-def process_careers_future_query(search_query: str) -> list:
+def _load_existing_jobs() -> tuple[set, set, frozenset]:
     """
-    Fetch jobs from CareersFuture and return them as a list of dictionaries.
+    Fetch existing job identifiers from Supabase, falling back to empty sets on failure.
+    Returns (job_ids, company_title_keys, supabase_job_ids). The first two are live sets that grow as
+    the run claims and saves jobs; supabase_job_ids is a frozen snapshot of the IDs Supabase held beforehand.
     """
-    # 1. Fetch all potential job items from CareersFuture search
-    careers_future_jobs = _fetch_careers_future_jobs(search_query)
-    if not careers_future_jobs:
-        print("No job items found in Phase 1. Skipping detail fetching.")
-        return []
-
-    # 2. Fetch existing job identifiers from Supabase
-    logging.info("Phase 2: Fetching existing job identifiers from Supabase...")
+    logger.info("Fetching existing job identifiers from Supabase...")
     try:
         job_ids_set_supabase, company_title_set_supabase = supabase_utils.get_existing_jobs_from_supabase()
-        logging.info(f"Phase 2: Supabase returned {len(job_ids_set_supabase)} existing IDs and {len(company_title_set_supabase)} company/title pairs.")
+        logger.info("Supabase returned %d existing IDs and %d company/title pairs.", len(job_ids_set_supabase), len(company_title_set_supabase))
     except Exception as e:
-        logging.error(f"Failed to fetch existing jobs from Supabase: {e}")
-        logging.warning("Proceeding without Supabase data; all fetched jobs will be considered new.")
+        logger.error("Failed to fetch existing jobs from Supabase: %s", e)
+        logger.warning("Proceeding without Supabase data; all fetched jobs will be considered new.")
         job_ids_set_supabase = set()
         company_title_set_supabase = set()
+    return job_ids_set_supabase, company_title_set_supabase, frozenset(job_ids_set_supabase)
+
+def process_careers_future_query(search_query: str, existing_jobs: tuple[set, set, frozenset] | None = None) -> Iterator[list]:
+    """
+    Fetch jobs from CareersFuture and yield them as lists of at most config.SAVE_BATCH_SIZE dictionaries.
+    existing_jobs is the result of _load_existing_jobs(); it is fetched when not given.
+    """
+    # 1. Fetch all potential job items from CareersFuture search
+    careers_future_jobs = _fetch_careers_future_jobs(search_query)
+    if not careers_future_jobs:
+        logger.info("No job items found in Phase 1. Skipping detail fetching.")
+        return
+
+    # 2. Fetch existing job identifiers from Supabase
+    if existing_jobs is None:
+        existing_jobs = _load_existing_jobs()
+    job_ids_set_supabase, company_title_set_supabase, _ = existing_jobs
 
     # 3. Filter the fetched jobs
-    logging.info("Phase 3: Filtering fetched jobs against Supabase data...")
+    logger.info("Phase 3: Filtering fetched jobs against Supabase data...")
     new_job_ids_to_process = []
     skipped_by_id_count = 0
     skipped_by_combo_count = 0
 
+    # Local bindings keep attribute and global lookups out of the per-item loop
+    get_company_name = _get_careers_future_job_company_name
+    add_job_id = new_job_ids_to_process.append
+    log_debug = logger.debug
+
     for job_item in careers_future_jobs:
         if not isinstance(job_item, dict):
-            logging.warning(f"Skipping invalid job item (not a dict): {str(job_item)[:100]}")
+            logger.warning("Skipping invalid job item (not a dict): %.100s", job_item)
             continue
 
-        job_uuid = str(job_item.get('uuid'))
+        job_get = job_item.get
+        raw_uuid = job_get('uuid')
+        if not raw_uuid:
+            # Without a UUID there is nothing to fetch details for or to claim
+            logger.warning("Skipping job item without a UUID: %.100s", job_item)
+            continue
+        job_uuid = str(raw_uuid)
+        job_title = job_get('title')
         
         # Check 1: Does the UUID already exist in Supabase?
-        if job_uuid and job_uuid in job_ids_set_supabase:
-            logging.debug(f"Skipping job (ID exists in Supabase): UUID='{job_uuid}', Title='{job_item.get('title', 'N/A')}'")
+        if job_uuid in job_ids_set_supabase:
+            log_debug("Skipping job (ID exists in Supabase): UUID='%s', Title='%s'", job_uuid, job_title or 'N/A')
             skipped_by_id_count += 1
             continue # Skip this job
 
         # Prepare for Check 2: Company & Title combination
-        company_name = _get_careers_future_job_company_name(job_item)
-        job_title = job_item.get('title')
+        company_name = get_company_name(job_item)
 
-        normalized_company = None
-        normalized_title = None
-
-        if company_name:
-            normalized_company = company_name.strip().lower()
-        if job_title:
-            normalized_title = job_title.strip().lower()
-        
-        if normalized_company and normalized_title:
-            company_title_key = (normalized_company, normalized_title)
+        # Same normalization as get_existing_jobs_from_supabase; the key is only built when both are present
+        if company_name and job_title:
+            company_title_key = (company_name.strip().casefold(), job_title.strip().casefold())
             if company_title_key in company_title_set_supabase:
-                logging.debug(f"Skipping job (Company/Title combo exists in Supabase): UUID='{job_uuid}', Company='{normalized_company}', Title='{normalized_title}'")
+                log_debug("Skipping job (Company/Title combo exists in Supabase): UUID='%s', Company='%s', Title='%s'", job_uuid, *company_title_key)
                 skipped_by_combo_count +=1
                 continue 
-        elif job_uuid: 
-            logging.debug(f"Job UUID='{job_uuid}' has no company/title for combo check. Will be added if ID is new.")
-        else: 
-             logging.warning(f"Job item has no UUID and insufficient company/title for matching: {str(job_item)[:100]}")
+        else:
+            log_debug("Job UUID='%s' has no company/title for combo check. Will be added if ID is new.", job_uuid)
 
 
-        new_job_ids_to_process.append(job_uuid) 
+        add_job_id(job_uuid) 
+        # Claim the ID so repeats in this query and overlapping later queries skip it
+        job_ids_set_supabase.add(job_uuid)
 
     # 4. Fetch details ONLY for the genuinely new job IDs
-    print(f"\n--- Phase 4: Fetching Job Details for {len(new_job_ids_to_process)} New Jobs ---")
-    detailed_new_jobs = []
+    logger.info("\n--- Phase 4: Fetching Job Details for %d New Jobs ---", len(new_job_ids_to_process))
     processed_count = 0
+    for detailed_new_jobs in _iter_new_job_details(_fetch_careers_future_job_details, new_job_ids_to_process):
+        processed_count += len(detailed_new_jobs)
+        yield detailed_new_jobs
 
-    for job_id in new_job_ids_to_process:
-        details = _fetch_careers_future_job_details(job_id)
-        if details:
-            # --- NEW: Check for description before adding ---
-            description = details.get('description')
-            if description and description.strip(): # Ensure it's not None or an empty/whitespace string
-                if 'job_id' in details and details['job_id'] is not None:
-                    detailed_new_jobs.append(details)
-                    processed_count += 1
-                else:
-                    
-                    logging.warning(f"Fetched details for {job_id} but missing 'job_id' key. Skipping.")
-            else:
-                
-                logging.warning(f"Skipping job ID {job_id} due to missing or empty description.") 
-        else:
-            
-            logging.warning(f"Skipping job ID {job_id} as detail fetching failed or returned no data.") 
+    logger.info("--- Finished Phase 4: Successfully fetched details for %d new job(s) ---", processed_count)
 
+BANNER = "=" * 20  # Framing for the per-query and end-of-run log headings
 
+class JobSaver:
+    """
+    Saves batches of new jobs to Supabase from a background thread, so the upserts
+    overlap the scraping that produces the next batch.
+    put() blocks once config.SAVE_QUEUE_MAX_BATCHES batches are waiting.
+    Call close() to save everything queued and stop the thread.
+
+    Args:
+        seen_store (SeenJobsStore | None): Records the job IDs whose upsert succeeded.
+    """
 
-    logging.info(f"--- Finished Phase 4: Successfully fetched details for {processed_count} new job(s) ---")
-    return detailed_new_jobs
+    def __init__(self, seen_store: SeenJobsStore | None = None):
+        self.seen_store = seen_store
+        self.saved_count = 0  # Jobs Supabase accepted; only written by the save thread
+        self._queue = queue.Queue(maxsize=config.SAVE_QUEUE_MAX_BATCHES)
+        self._thread = threading.Thread(target=self._run, name="job-saver", daemon=True)
+        self._thread.start()
+
+    def put(self, source_name: str, jobs: list):
+        """Queue a batch of job details from source_name for saving"""
+        self._queue.put((source_name, jobs))
+
+    def close(self):
+        """Block until every queued batch has been saved, then stop the save thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            source_name, jobs = item
+            try:
+                saved_job_ids = supabase_utils.save_jobs_to_supabase(jobs)
+                if self.seen_store is not None and saved_job_ids:
+                    self.seen_store.add(source_name, saved_job_ids)
+                self.saved_count += len(saved_job_ids)
+            except Exception as e:
+                logger.error("Failed to save %d %s job(s): %s", len(jobs), source_name, e, exc_info=True)
+
+def run_source(source_name: str, queries: list, process_query, existing_jobs: tuple[set, set, frozenset], saver: JobSaver) -> int:
+    """
+    Runs every query of one job source in turn, handing new jobs to saver batch by batch.
+    process_query(query, existing_jobs) yields lists of new job details for a query.
+    Queries within a source stay sequential so each site sees one client at a time.
+    Returns the number of jobs queued for saving.
+    """
+    total_queued = 0
+    save_jobs = saver.put
+    logger.info("\n--- Starting %s Job Scraping ---", source_name)
+    for query in queries:
+        logger.info("\n%s Processing %s Search Query: '%s' %s", BANNER, source_name, query, BANNER)
+
+        # Scrape IDs, filter, and fetch new details, queueing each batch for saving as soon as it is ready
+        query_queued = 0
+        for new_job_details in process_query(query, existing_jobs):
+            logger.info("\n--- Queueing %d new job(s) for %s query '%s' for saving ---", len(new_job_details), source_name, query)
+            # Remembered now rather than after the save so the next query already skips them
+            _remember_saved_jobs(existing_jobs, new_job_details)
+            save_jobs(source_name, new_job_details)
+            query_queued += len(new_job_details)
+
+        if not query_queued:
+            logger.info("\nNo new job details were fetched or processed for %s query '%s'.", source_name, query)
+        total_queued += query_queued
+    return total_queued
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Command-line options for running a subset of the configured sources and queries."""
+    parser = argparse.ArgumentParser(description="Scrape new jobs from LinkedIn and CareersFuture into Supabase.")
+    parser.add_argument("--source", choices=["linkedin", "careersfuture", "all"], default="all",
+                        help="Which source to scrape (default: all)")
+    parser.add_argument("--query", action="append",
+                        help="Search query to run instead of the configured list; repeat for several queries")
+    return parser.parse_args(argv)
 
 # --- Main Execution ---
 if __name__ == "__main__":
 
-    total_new_jobs_saved = 0
+    args = _parse_args()
 
-    # Get jobs from LinkedIn
-    logging.info("\n--- Starting LinkedIn Job Scraping ---")
-    for query in config.LINKEDIN_SEARCH_QUERIES:
-        print(f"\n{'='*20} Processing Search Query: '{query}' {'='*20}")
+    # Every asyncio.run() below, in either source thread, creates its loop through this policy
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-        # 1. Process the query: Scrape IDs, filter, fetch new details
-        new_linkedin_job_details = process_linkedin_query(query, config.LINKEDIN_LOCATION)
+    # Fork the LinkedIn parse workers before the save and source threads start
+    if args.source in ("linkedin", "all"):
+        _get_parse_pool()
 
-        # 2. Save the NEW scraped data to Supabase
-        if new_linkedin_job_details:
-            print(f"\n--- Saving {len(new_linkedin_job_details)} new job(s) for query '{query}' ---")
-            supabase_utils.save_jobs_to_supabase(new_linkedin_job_details)
-            total_new_jobs_saved += len(new_linkedin_job_details)
-        else:
-            print(f"\nNo new job details were fetched or processed for query '{query}'.")
-
-    # Get jobs from Careers Future
-    logging.info(f"\n--- Starting Careers Future Job Scraping ---")
-    for query in config.CAREERS_FUTURE_SEARCH_QUERIES:
-        logging.info(f"\n{'='*20} Processing Careers Future Search Query: '{query}' {'='*20}")
-
-        # 1. Process the query: Scrape IDs, filter, fetch new details
-        new_careers_future_job_details = process_careers_future_query(query)
+    seen_store = SeenJobsStore()
+    saver = JobSaver(seen_store)
 
-        # 2. Save the NEW scraped data to Supabase
-        if new_careers_future_job_details:
-            logging.info(f"\n--- Saving {len(new_careers_future_job_details)} new job(s) for query '{query}' ---")
-            supabase_utils.save_jobs_to_supabase(new_careers_future_job_details)
-            total_new_jobs_saved += len(new_careers_future_job_details)
-        else:
-            logging.info(f"\nNo new job details were fetched or processed for query '{query}'.")
+    try:
+        # Read the existing jobs once for the whole run; jobs saved below are added to it
+        existing_jobs = _load_existing_jobs()
+
+        # IDs saved by earlier runs on this machine are skipped even if the Supabase read failed
+        seen_job_ids = seen_store.job_ids()
+        logger.info("Seen jobs cache holds %d job IDs from earlier runs.", len(seen_job_ids))
+        existing_jobs[0].update(seen_job_ids)
+
+        # The sources hit different hosts and share only the thread-safe existing_jobs sets
+        # and Gemini quota, so they run side by side
+        # --source and --query narrow the run, e.g. to resume a failed source or shard queries across runners
+        linkedin_location = config.LINKEDIN_LOCATION
+        sources = []
+        if args.source in ("linkedin", "all"):
+            sources.append(("LinkedIn", args.query or config.LINKEDIN_SEARCH_QUERIES,
+                            lambda query, existing: process_linkedin_query(query, linkedin_location, existing)))
+        if args.source in ("careersfuture", "all"):
+            sources.append(("Careers Future", args.query or config.CAREERS_FUTURE_SEARCH_QUERIES,
+                            process_careers_future_query))
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                executor.submit(run_source, source_name, queries, process_query, existing_jobs, saver): source_name
+                for source_name, queries, process_query in sources
+            }
+            for future in as_completed(futures):
+                try:
+                    logger.info("%s queued %d new job(s) for saving.", futures[future], future.result())
+                except Exception as e:
+                    logger.error("%s scraping failed: %s", futures[future], e, exc_info=True)
+    finally:
+        # The pooled sessions are shared by every query above
+        linkedin_session.close()
+        careers_future_session.close()
+        # Let the save thread finish the queued batches before its stores are closed
+        saver.close()
+        seen_store.close()
+        supabase_utils.close()
 
     # --- End of Script ---      
-    logging.info(f"\n{'='*20} Job scraping script finished {'='*20}")
-    logging.info(f"Total new jobs saved across all queries: {total_new_jobs_saved}")
+    logger.info("\n%s Job scraping script finished %s", BANNER, BANNER)
+    logger.info("Total new jobs saved across all queries: %d", saver.saved_count)
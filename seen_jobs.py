@@ -0,0 +1,56 @@
+"""
+Local record of job IDs already saved to Supabase.
+Kept in a small SQLite database so repeat runs on the same machine can skip known
+jobs even when the Supabase read fails.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+
+class SeenJobsStore:
+    """
+    (source, job_id) pairs saved in earlier runs, with the time each was first seen.
+    A single connection is shared by the scraper threads; a lock serializes access to it.
+
+    Args:
+        db_path (str): Path of the SQLite database; parent directories are created if missing.
+    """
+
+    def __init__(self, db_path=config.SEEN_JOBS_DB_PATH):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                "source TEXT NOT NULL, job_id TEXT NOT NULL, first_seen_ts REAL NOT NULL, "
+                "PRIMARY KEY (source, job_id))"
+            )
+
+    def job_ids(self, source=None) -> set[str]:
+        """All recorded job IDs, optionally limited to one source"""
+        with self._lock:
+            if source is None:
+                rows = self._conn.execute("SELECT job_id FROM seen")
+            else:
+                rows = self._conn.execute("SELECT job_id FROM seen WHERE source = ?", (source,))
+            return {job_id for (job_id,) in rows}
+
+    def add(self, source, job_ids):
+        """Record job_ids for source; IDs already recorded keep their first_seen_ts"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (source, job_id, first_seen_ts) VALUES (?, ?, ?)",
+                [(source, str(job_id), now) for job_id in job_ids],
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
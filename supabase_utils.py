@@ -4,6 +4,10 @@ from typing import Optional, Any
 from models import Resume
 import datetime # Import datetime module
 import logging # Import logging
+import atexit
+import queue
+import threading
+import time
 
 # --- Initialize Supabase Client ---
 # Ensure URL and Key are provided
@@ -18,7 +22,7 @@ def get_existing_jobs_from_supabase(batch_size: int = 1000) -> tuple[set, set]:
     Fetches all existing job IDs and company-title pairs from the Supabase 'jobs' table.
     Returns:
         - A set of job_ids
-        - A set of 'company|job_title' keys (both lowercased for consistency)
+        - A set of (company, job_title) keys, stripped and casefolded for consistency
     """
     existing_ids = set()
     existing_company_title_keys = set()
@@ -47,9 +51,7 @@ def get_existing_jobs_from_supabase(batch_size: int = 1000) -> tuple[set, set]:
                     existing_ids.add(str(job_id))
 
                 if company and job_title:
-                    normalized_company = company.strip().lower()
-                    normalized_title = job_title.strip().lower()
-                    existing_company_title_keys.add((normalized_company, normalized_title))
+                    existing_company_title_keys.add((company.strip().casefold(), job_title.strip().casefold()))
 
             offset += batch_size
 
@@ -60,46 +62,58 @@ def get_existing_jobs_from_supabase(batch_size: int = 1000) -> tuple[set, set]:
 
     return existing_ids, existing_company_title_keys
 
-def save_jobs_to_supabase(jobs_data: list):
+def save_jobs_to_supabase(jobs_data: list, batch_size: int = 500) -> list[str]:
     """
     Saves or updates a list of job data dictionaries to the Supabase table using upsert.
     This avoids duplicate key errors by updating existing records based on job_id.
+    Rows are sent in bulk upserts of up to batch_size rows to stay under PostgREST payload limits.
+    Returns the job_ids of the rows whose upsert succeeded.
     """
     if not jobs_data:
         print("No job data provided to save/update.")
-        return
+        return []
 
     # Ensure job_id is present and potentially convert to the correct type if needed
     # (Assuming job_id in jobs_data is already the correct string type for your 'text' column)
-    processed_jobs_data = []
+    processed_jobs_data = {}  # Keyed by job_id: Postgres rejects an upsert that touches the same row twice
     for job in jobs_data:
         if 'job_id' in job and job['job_id'] is not None:
              # If your Supabase job_id column was numeric, you'd convert here:
              # try:
              #     job['job_id'] = int(job['job_id'])
-             #     processed_jobs_data.append(job)
+             #     processed_jobs_data[job['job_id']] = job
              # except (ValueError, TypeError):
              #     print(f"Warning: Invalid job_id format found: {job.get('job_id')}. Skipping.")
              # Since it's text, just ensure it's a string (it likely already is)
              job['job_id'] = str(job['job_id'])
-             processed_jobs_data.append(job)
+             processed_jobs_data[job['job_id']] = job
         else:
             print(f"Warning: Job data missing job_id. Skipping: {job}")
 
 
     if not processed_jobs_data:
         print("No valid job data remaining after processing.")
-        return
+        return []
 
+    processed_jobs_data = list(processed_jobs_data.values())
     print(f"Attempting to upsert {len(processed_jobs_data)} jobs to Supabase...")
 
+    saved_job_ids = []
+    for batch_start in range(0, len(processed_jobs_data), batch_size):
+        batch = processed_jobs_data[batch_start:batch_start + batch_size]
+        if _upsert_jobs_batch(batch):
+            saved_job_ids.extend(job['job_id'] for job in batch)
+    return saved_job_ids
+
+def _upsert_jobs_batch(processed_jobs_data: list) -> bool:
+    """Upserts one batch of validated job rows in a single request. Returns False if the request failed."""
     try:
         # Use table name from config
         # Use upsert instead of insert. It will insert new rows
         # or update existing rows if a job_id conflict occurs based on the primary key.
         # Ensure 'job_id' is the primary key or has a unique constraint in your Supabase table.
         # By default, supabase-py's upsert updates the row on conflict.
-        data, count = supabase.table(config.SUPABASE_TABLE_NAME).upsert(processed_jobs_data).execute()
+        data, count = supabase.table(config.SUPABASE_TABLE_NAME).upsert(processed_jobs_data, on_conflict='job_id').execute()
 
         # Check the actual response structure from your Supabase client version for upsert
         # It might differ slightly from insert's response structure
@@ -112,67 +126,110 @@ def save_jobs_to_supabase(jobs_data: list):
         else:
              # Log raw response if structure is unexpected or for debugging
              print(f"Attempted to upsert {len(processed_jobs_data)} jobs. Supabase response: {data}")
+        return True
 
     except Exception as e:
         print(f"Error upserting data to Supabase: {e}")
         # Consider logging the data that failed to upsert for debugging
         # print(f"Failed data: {processed_jobs_data}")
+        return False
+
+class BatchWriter:
+    """
+    Upserts rows to a Supabase table from a background thread.
+    Rows queued with put() are sent in batches of up to max_batch_size, or whatever
+    arrived within max_wait seconds of the first row, in a single round-trip.
+    Call flush() to block until everything queued so far has been written;
+    it is also registered with atexit.
+    """
+
+    def __init__(self, table_name: str, on_conflict: Optional[str] = None,
+                 max_batch_size: int = 50, max_wait: float = 0.5):
+        self.table_name = table_name
+        self.on_conflict = on_conflict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def put(self, row: dict):
+        """Queue a row for writing and return immediately"""
+        if self._thread is None:
+            # Start the worker on first use so importing this module stays side-effect free
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=f"{self.table_name}-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put(row)
+
+    def flush(self):
+        """Block until every queued row has been written (or failed)"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: list):
+        if self.on_conflict:
+            # Postgres rejects an upsert that touches the same row twice; keep the latest per key
+            batch = list({row[self.on_conflict]: row for row in batch}.values())
+        try:
+            query = supabase.table(self.table_name)
+            if self.on_conflict:
+                query = query.upsert(batch, on_conflict=self.on_conflict)
+            else:
+                query = query.upsert(batch)
+            query.execute()
+            print(f"Successfully upserted {len(batch)} rows into table '{self.table_name}'.")
+        except Exception as e:
+            print(f"Error upserting batch of {len(batch)} rows to table '{self.table_name}': {e}")
+
+resume_writer = BatchWriter(config.SUPABASE_RESUME_TABLE_NAME, on_conflict='email')
+
+def close():
+    """
+    Flushes queued resume rows, then closes the pooled HTTP connections of the shared Supabase client.
+    Call once a script is done with Supabase; the client cannot be used afterwards.
+    """
+    resume_writer.flush()
+    supabase.postgrest.session.close()
 
-def save_resume_to_supabase(resume_data: dict):
+def queue_resume_for_supabase(resume_data: dict):
     """
-    Saves or updates parsed resume data to the Supabase 'resumes' table based on email.
-    Includes a timestamp indicating when the parsing occurred.
+    Queues parsed resume data for a background upsert into the 'resumes' table based on email.
+    Adds a 'parsed_at' timestamp and returns without waiting for Supabase.
     Requires the 'email' column in the Supabase table to have a UNIQUE constraint.
+    Rows are written by resume_writer; call resume_writer.flush() to wait for them.
     """
     if not resume_data:
         print("No resume data provided to save.")
         return
 
-    # Ensure email is present, as it's the key for upsert
     if 'email' not in resume_data or not resume_data['email']:
         print("Error: Resume data must contain a valid 'email' field for upserting.")
         return
 
-    # Ensure the resume table name is configured
-    if not hasattr(config, 'SUPABASE_RESUME_TABLE_NAME') or not config.SUPABASE_RESUME_TABLE_NAME:
-        print("Error: SUPABASE_RESUME_TABLE_NAME is not defined in config.py")
-        return
-
-    # Add/Update the current timestamp for the operation
-    # Use ISO 8601 format, which Supabase handles well for TIMESTAMPTZ
     resume_data['parsed_at'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-
-    print(f"Attempting to upsert resume data for {resume_data['email']} into table '{config.SUPABASE_RESUME_TABLE_NAME}'...")
-
-    try:
-        # Use upsert instead of insert.
-        # Specify 'email' as the column to check for conflicts.
-        # If a row with the same email exists, it will be updated. Otherwise, a new row is inserted.
-        # Ensure your Supabase 'resumes' table columns match the keys in resume_data
-        # and that columns for lists/nested objects (like skills, education, experience) are JSONB type.
-        data, count = supabase.table(config.SUPABASE_RESUME_TABLE_NAME)\
-                              .upsert(resume_data, on_conflict='email')\
-                              .execute()
-
-        # Check response structure for upsert (might be similar to insert or jobs upsert)
-        if data and isinstance(data, tuple) and len(data) > 1:
-             actual_data = data[1]
-             # Check if actual_data is a list and not empty to determine if records were returned
-             if isinstance(actual_data, list) and actual_data:
-                 print(f"Successfully upserted resume data for {resume_data['email']}. Records affected/returned: {len(actual_data)}.")
-                 # print(f"Supabase response data: {actual_data}") # Optional: log response
-             else:
-                 # Upsert might return an empty list or different structure on success depending on version/scenario
-                 print(f"Successfully executed upsert for resume data for {resume_data['email']}. Supabase response count: {count}")
-        else:
-             # Log raw response if structure is unexpected
-             print(f"Attempted to upsert resume data for {resume_data['email']}. Supabase response: {data}")
-
-
-    except Exception as e:
-        print(f"Error upserting resume data to Supabase: {e}")
-        # Consider logging the data that failed to upsert
-        # print(f"Failed data: {resume_data}")
+    print(f"Queued resume data for {resume_data['email']} for upsert into table '{config.SUPABASE_RESUME_TABLE_NAME}'.")
+    resume_writer.put(resume_data)
 
 def get_resume_by_email(email: str) -> dict | None:
     """